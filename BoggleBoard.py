@@ -1,6 +1,12 @@
-from boggle_board_randomizer import randomize_board
+import sys
+import time
+from boggle_board_randomizer import randomize_board, BOARD_SIZE
 import ex11_utils
-from typing import List, Tuple, Set
+from boggle_dictionary import load_dictionary
+from boggle_pool import BoardPool, Range
+from boggle_stats import SolverStats
+from boggle_trie import PathIndex, PathNode, WordTrie
+from typing import List, Tuple, Set, Optional, Dict
 from copy import deepcopy
 
 Board = List[List[str]]
@@ -10,89 +16,246 @@ VisitedBoard = List[List[bool]]
 
 
 WORDS_PATH = "boggle_dict.txt"
+GAME_TIME = 180  # 3 minutes in seconds
+# Boards that take longer to solve are reported to stderr
+SLOW_SOLVE_SECONDS = 0.5
 
 
 class BoggleBoard:
     """The Boggle board class that handles the game board logic"""
-    def __init__(self):
+    def __init__(self, rows: int = BOARD_SIZE, cols: int = BOARD_SIZE,
+                 dice: Optional[List[List[str]]] = None,
+                 same_board_as: Optional["BoggleBoard"] = None,
+                 collect_stats: bool = False,
+                 pool: Optional[BoardPool] = None,
+                 score_range: Range = None, words_range: Range = None,
+                 words_path: str = WORDS_PATH):
         """
         Initialize the Boggle Board
+        :param rows: The number of rows in the board
+        :param cols: The number of columns in the board
+        :param dice: The dice to roll the board from, the dice set of the
+        board size if None
+        :param same_board_as: Another game to play the same board as. The
+        board and its solved words are shared with it instead of being
+        randomized and solved again.
+        :param collect_stats: True to count the work of solving the board,
+        so it can be reported if the board is slow
+        :param pool: Solved boards to pick the board from instead of rolling
+        the dice, if it has a board of the size within the ranges
+        :param score_range: The range of max scores to pick from the pool
+        :param words_range: The range of word counts to pick from the pool
+        :param words_path: Path to the words file of the game
         """
-        self.__board = randomize_board()
-        self.__load_game_words()
-        self.__max_score_paths = ex11_utils.max_score_paths(self.__board,
-                                                            self.__words)
+        self.__words_path = words_path
+        if same_board_as is None:
+            # The settings new boards are rolled with
+            self.__rows = rows
+            self.__cols = cols
+            self.__dice = dice
+            self.__collect_stats = collect_stats
+            self.__pool = pool
+            self.__score_range = score_range
+            self.__words_range = words_range
+            self.__roll_board()
+        else:
+            # The shared data is never changed by a game
+            self.__words_path = same_board_as.__words_path
+            self.__rows = same_board_as.__rows
+            self.__cols = same_board_as.__cols
+            self.__dice = same_board_as.__dice
+            self.__collect_stats = same_board_as.__collect_stats
+            self.__pool = same_board_as.__pool
+            self.__score_range = same_board_as.__score_range
+            self.__words_range = same_board_as.__words_range
+            self.__board = same_board_as.__board
+            self.__words = same_board_as.__words
+            self.__path_index = same_board_as.__path_index
+            self.__solver_stats = same_board_as.__solver_stats
+            self.__solve_time = same_board_as.__solve_time
+            self.__board_words = same_board_as.__board_words
+            self.__max_score_paths = same_board_as.__max_score_paths
+            self.__max_score = same_board_as.__max_score
+        self.reset()
+
+    def __roll_board(self) -> None:
+        """
+        Function picks a board from the pool or rolls the dice for one with
+        the settings of the game, and solves it.
+        """
+        entry = None
+        if self.__pool is not None and \
+                self.__pool.get_size() == (self.__rows, self.__cols):
+            entry = self.__pool.pick_board(self.__score_range,
+                                           self.__words_range)
+        if entry is None:
+            self.__board = randomize_board(self.__dice, self.__rows,
+                                           self.__cols)
+            self.__load_game_words()
+        else:
+            self.__board = entry["board"]
+            # The words of a pooled board are known, so only their paths
+            # are searched for
+            self.__words = WordTrie(entry["words"])
+        # Every path of every word, so hints never search the board
+        self.__path_index = PathIndex()
+        self.__solver_stats = SolverStats() if self.__collect_stats \
+            else None
+        start = time.perf_counter()
+        self.__board_words = ex11_utils.solve_board(
+            self.__board, self.__words, path_index=self.__path_index,
+            stats=self.__solver_stats)
+        self.__solve_time = time.perf_counter() - start
+        if self.__solve_time > SLOW_SOLVE_SECONDS:
+            self.__report_slow_board()
+        self.__max_score_paths = list(self.__board_words.values())
         self.__max_score = ex11_utils.get_score(self.__max_score_paths)
-        self.__all_board_words = self.__get_all_words()
-        self.__paths = []
+
+    def new_board(self, rows: Optional[int] = None,
+                  cols: Optional[int] = None,
+                  dice: Optional[List[List[str]]] = None,
+                  collect_stats: Optional[bool] = None,
+                  pool: Optional[BoardPool] = None,
+                  score_range: Range = None,
+                  words_range: Range = None) -> None:
+        """
+        Function replaces the board with a new one and starts a new game on
+        it. The parameters are the ones of __init__, and the ones that are
+        None keep the settings the game was created with. Games that share
+        the old board with same_board_as keep playing it.
+        """
+        if rows is not None:
+            self.__rows = rows
+        if cols is not None:
+            self.__cols = cols
+        if dice is not None:
+            self.__dice = dice
+        if collect_stats is not None:
+            self.__collect_stats = collect_stats
+        if pool is not None:
+            self.__pool = pool
+        if score_range is not None:
+            self.__score_range = score_range
+        if words_range is not None:
+            self.__words_range = words_range
+        self.__roll_board()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Function starts the game over on the same board: the score, the
+        submitted words and the current path are cleared.
+        """
+        # The submitted words, in the order they were submitted
         self.__submitted_words = []
+        # The score of the best path submitted for every found word
+        self.__word_scores: Dict[str, int] = dict()
         self.__score = 0
+        # The words and points left to find, by the length of the words
+        self.__remaining_by_length: Dict[int, List[int]] = dict()
+        for word, path in self.__board_words.items():
+            remaining = self.__remaining_by_length.setdefault(len(word),
+                                                              [0, 0])
+            remaining[0] += 1
+            remaining[1] += ex11_utils.get_score([path])
+        self.__remaining_words = len(self.__board_words)
         self.__current_path = []
+        # The cell index of the last step and a bitmask of the path cells
+        self.__current_cell = 0
+        self.__current_visited = 0
+        # The path index node of the current path, None if no word starts
+        # with it
+        self.__current_prefix: Optional[PathNode] = \
+            self.__path_index.get_root()
         self.__hit_max_score = False
         self.__found_all_words = False
 
     def __load_game_words(self) -> None:
         """
-        Function loads all the game words from boggle_dict.txt
+        Function loads all the game words from the words file of the game.
+        The words trie is shared by all the games of the file in the process.
+        """
+        self.__words = load_dictionary(self.__words_path)
+
+    def __report_slow_board(self) -> None:
+        """
+        Function reports to stderr a board that was slow to solve, with the
+        stats of solving it if they were collected.
         """
+        text = f"slow board solved in {self.__solve_time:.3f} s: " \
+               f"{self.__board}"
+        if self.__solver_stats is not None:
+            text += f"\n  {self.__solver_stats}"
+        print(text, file=sys.stderr)
 
-        # Open the file and read its contents
-        with open(WORDS_PATH, "r") as file:
-            content = file.read()
+    def get_solve_time(self) -> float:
+        """Returns the seconds it took to solve the board"""
+        return self.__solve_time
 
-        # Split the contents into individual words and remove whitespace
-        self.__words = [word for word in content.split()]
+    def get_solver_stats(self) -> Optional[SolverStats]:
+        """Returns the stats of solving the board, None if they weren't
+        collected"""
+        return self.__solver_stats
 
     def get_next_possible_moves(self, coordinate: Coordinate) \
             -> Set[Coordinate]:
         """
-        Function receives a coordinate of a button on the board and changes
-        that all the buttons next to it are gray and enabled and the other
-        buttons are white and disabled.
+        Function receives a coordinate of a button on the board and returns
+        the coordinates the player can move to from it: the coordinate
+        itself and the coordinates next to it.
         :param coordinate: The coordinate indexes
+        :return: A set of the coordinates
         """
-        next_possible_moves = set()
         row, col = coordinate
-        for r in range(len(self.__board)):
-            for c in range(len(self.__board[0])):
-                if ex11_utils.is_in_board(self.__board, (r, c)) and \
-                        ex11_utils.is_valid_distance((row, col), (r, c)):
-                    # if player can do this move
-                    next_possible_moves.add((r, c))
+        cols = len(self.__board[0])
+        neighbors = ex11_utils.get_neighbors_table(self.__board)
+        next_possible_moves = {coordinate}
+        for cell, _ in neighbors[row * cols + col]:
+            next_possible_moves.add(divmod(cell, cols))
         return next_possible_moves
 
     def add_submitted_word(self, ) -> bool:
         """
         Function adds a word that has been submitted and from the
         self.__current_path. Returns True if successful, False otherwise.
+        A word that was already found is accepted again only for a longer
+        path, and only the best path of every word is scored, like in
+        max_score_paths.
         :return: True if addition successful, False otherwise.
         """
         path = self.__current_path
         self.__current_path = []
-        if not ex11_utils.is_valid_path(self.__board, path, self.__words):
+        self.__current_visited = 0
+        self.__current_prefix = self.__path_index.get_root()
+        # Every dictionary word the board can build was found when solving
+        # the board, so it is enough to look the word up in them.
+        word = ex11_utils.is_valid_path(self.__board, path,
+                                        self.__board_words)
+        if word is None:
+            return False
+        path_score = ex11_utils.get_score([path])
+        found_score = self.__word_scores.get(word)
+        if found_score is not None and path_score <= found_score:
             return False
-        word = ex11_utils.build_word(path, self.__board)
-        if word not in self.__submitted_words:
-            self.__submitted_words.insert(0, word)
-            self.__paths.append(path)
-            self.__update_score()
-            if self.__score == self.__max_score:
-                self.__hit_max_score = True
-            if self.__get_all_words(self.__paths) == self.__all_board_words:
-                self.__found_all_words = True
-            return True
-        return False
+        remaining = self.__remaining_by_length[len(word)]
+        if found_score is None:
+            self.__submitted_words.append(word)
+            found_score = 0
+            remaining[0] -= 1
+            self.__remaining_words -= 1
+        self.__word_scores[word] = path_score
+        self.__score += path_score - found_score
+        remaining[1] -= path_score - found_score
+        if self.__score == self.__max_score:
+            self.__hit_max_score = True
+        if self.__remaining_words == 0:
+            self.__found_all_words = True
+        return True
 
     def get_board_copy(self) -> Board:
         """Returns a copy of the game board"""
         return deepcopy(self.__board)
 
-    def __update_score(self) -> None:
-        """
-        Function updates the game score.
-        """
-        self.__score = ex11_utils.get_score(self.__paths)
-
     def get_score(self) -> int:
         """Returns the game score"""
         return self.__score
@@ -104,36 +267,73 @@ class BoggleBoard:
         :param coordinate: coordinates of the next step.
         :return: True if valid next coordinate, False otherwise.
         """
-        if coordinate in self.get_next_possible_moves(coordinate):
-            self.__current_path.append(coordinate)
-            return True
-        else:
+        if not ex11_utils.is_in_board(self.__board, coordinate):
             return False
+        row, col = coordinate
+        cell = row * len(self.__board[0]) + col
+        if self.__current_path:
+            # The next step must be next to the last one and not visited
+            masks = ex11_utils.get_neighbor_masks(self.__board)
+            if not masks[self.__current_cell] >> cell & 1 or \
+                    self.__current_visited >> cell & 1:
+                return False
+        self.__current_path.append(coordinate)
+        self.__current_cell = cell
+        self.__current_visited |= 1 << cell
+        if self.__current_prefix is not None:
+            self.__current_prefix = self.__current_prefix.children.get(cell)
+        return True
 
     def get_submitted_words(self) -> List[str]:
-        """Return the submitted words in the game"""
-        return self.__submitted_words
+        """Return the submitted words in the game, the last submitted
+        first"""
+        return self.__submitted_words[::-1]
 
     def is_max_score(self) -> bool:
         """Function returns True if the game has reached the max score,
         False otherwise."""
         return self.__hit_max_score
 
-    def __get_all_words(self, paths=None) -> Set[str]:
-        """
-        Function returns a set of all the built words from the paths on the
-        board. If no path is given, the self.__max_score_paths is used.
-        :param paths: a list of paths on the board
-        :return: A set of all the words
-        """
-        all_words = set()
-        if not paths:
-            paths = self.__max_score_paths
-        for path in paths:
-            all_words.add(ex11_utils.build_word(path, self.__board))
-        return all_words
-
     def is_found_all_words(self) -> bool:
         """Function returns True if all the words on the board have been
         found."""
         return self.__found_all_words
+
+    def get_remaining_by_length(self) -> Dict[int, Tuple[int, int]]:
+        """
+        Function returns hints of what is left to find on the board.
+        :return: A dict of word length to the number of words of that length
+        that weren't found yet and the points left to get for words of that
+        length, by increasing length. Lengths with nothing left are skipped.
+        """
+        return {length: (words, points) for length, (words, points)
+                in sorted(self.__remaining_by_length.items())
+                if words or points}
+
+    def get_current_words_count(self) -> int:
+        """
+        Function returns the number of words on the board that have a path
+        starting with the current path, including the word of the current
+        path itself. The path index is only looked up, so this takes O(1).
+        :return: The number of words, 0 if the current path is a dead end.
+        """
+        if self.__current_prefix is None:
+            return 0
+        return len(self.__current_prefix.words)
+
+    def is_current_path_prefix(self) -> bool:
+        """Function returns True if the current path is the start of a path
+        of a word on the board, False otherwise."""
+        return self.__current_prefix is not None
+
+    def get_next_word_moves(self) -> Set[Coordinate]:
+        """
+        Function returns the coordinates that continue the current path
+        towards a word on the board.
+        :return: A set of the coordinates, empty if the current path is a
+        dead end.
+        """
+        if self.__current_prefix is None:
+            return set()
+        cols = len(self.__board[0])
+        return {divmod(cell, cols) for cell in self.__current_prefix.children}
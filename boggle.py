@@ -1,10 +1,12 @@
 import tkinter as tk
 import time
-from pygame import mixer
 from BoggleBoard import *
+from boggle_assets import AssetManager
+from boggle_pipeline import BoardPipeline
+from boggle_pool import load_board_pool
 import random
+from typing import Optional, Set
 
-GAME_TIME = 180  # 3 minutes in seconds
 FONT = 'Century Gothic'
 LOBBY_BEFORE_START_PATH = 'sounds/lobby_before_start.mp3'
 GAME_PLAY_PATH = 'sounds/game_play.mp3'
@@ -18,6 +20,8 @@ BG_COLOR = 'light blue'
 MAX_SCORE_WIN = 'You Won! You got the max score!'
 FOUND_ALL_WORDS = 'You found all the words in the game!'
 INVALID_WORD = 'Invalid Word!'
+DEAD_END = 'No word goes this way!'
+HINT_COLOR = 'light green'
 ICYTOWER_SOUNDS = ['sounds/icy_tower/aight.ogg',
                    'sounds/icy_tower/amazing.ogg',
                    'sounds/icy_tower/cheer.ogg',
@@ -31,27 +35,44 @@ ICYTOWER_SOUNDS = ['sounds/icy_tower/aight.ogg',
                    'sounds/icy_tower/unbelievable.ogg',
                    'sounds/icy_tower/wow.ogg']
 TIMES_UP = "Time's up! Play another game?"
+PREPARING_BOARD = 'Preparing the next board...'
+BOARD_CHECK_MS = 100
+# Boards from the pool have at least this many words, if there is a pool
+GAME_WORDS_RANGE = (60, None)
 
 
 class BoggleGUI:
     """The Boggle GUI class that handles the GUI of the boggle game and runs
     the game."""
-    def __init__(self, boggle_board: BoggleBoard):
-        """Init for the board GUI"""
+    def __init__(self, boggle_board: BoggleBoard,
+                 pipeline: Optional[BoardPipeline] = None):
+        """
+        Init for the board GUI
+        :param boggle_board: The board of the game
+        :param pipeline: Prepares the boards of the next games, if None the
+        next board is created when the player asks for it
+        """
         self.__root = tk.Tk()
         self.__root.config(bg=BG_COLOR)
         self.__root.title("Boggle Game")
         self.__root.geometry("700x600")
         self.__boggle_board = boggle_board
+        self.__pipeline = pipeline
         self.__board_frame = None
         self.__board_buttons = []
         self.__words_text = None
         self.__submit_button = None
         self.__start_button = None
-        self.__start_pic = tk.PhotoImage(file=START_GAME_PATH)
-        self.__submit_pic = tk.PhotoImage(file=SUBMIT_BUTTON_PATH)
+        self.__assets = AssetManager()
+        # Decoded now so the clicks of the game never wait for them
+        self.__assets.preload_sounds([POP_PATH, INCORRECT_SOUND_PATH,
+                                      END_GAME_PATH] + ICYTOWER_SOUNDS)
+        self.__start_pic = self.__assets.get_image(START_GAME_PATH)
+        self.__submit_pic = self.__assets.get_image(SUBMIT_BUTTON_PATH)
         self.__timer_label = None
         self.__start_time = None
+        # The pending timer update, cancelled if the game ends early
+        self.__timer_job: Optional[str] = None
         self.__word_entry = None
         self.__word_listbox = None
         self.__score_label = None
@@ -59,15 +80,22 @@ class BoggleGUI:
         self.__y_button = None
         self.__n_button = None
         self.__invalid_word_label = None
+        self.__end_frame = None
         self.__submitted_words = []
-        self.__clicked_buttons = set()
-        mixer.init()
+        self.__clicked_cells = set()
+        # The cells that are gray and enabled, None while all the buttons
+        # are white and enabled before the first letter of a word
+        self.__enabled_cells: Optional[Set[Coordinate]] = None
+        # The enabled cells that lead to a word on the board
+        self.__hinted_cells: Set[Coordinate] = set()
         self.__create_widgets()
         self.__root.mainloop()
 
     def __create_widgets(self) -> None:
         """
-        Function create widgets before game starts.
+        Function creates the widgets of all the games of the window, and
+        shows the ones of the start screen. The widgets of the game and of
+        its end are shown and hidden as the games go.
         """
         self.__start_button = tk.Button(self.__root,
                                         command=self.__start_game,
@@ -77,54 +105,84 @@ class BoggleGUI:
         self.__timer_label = tk.Label(self.__root, text="",
                                       font=(FONT, 16, "bold"), bg=BG_COLOR)
         self.__timer_label.pack()
-        mixer.Channel(0).play(mixer.Sound(LOBBY_BEFORE_START_PATH), loops=-1)
+
+        self.__board_frame = tk.Frame(self.__root, width=400, height=400)
+        self.__word_entry = tk.Entry(self.__root, font=(FONT, 12, "bold"))
+        self.__word_entry.bind('<KeyPress>', lambda x: 'break')
+        self.__submit_button = tk.Button(self.__root, image=self.__submit_pic,
+                                         command=self.__submit_words,
+                                         bg=BG_COLOR)
+        self.__word_listbox = tk.Listbox(self.__root, height=17, width=25,
+                                         bg=BG_COLOR)
+        self.__invalid_word_label = tk.Label(self.__root, text="",
+                                             font=(FONT, 12),
+                                             bg=BG_COLOR)
+        self.__score_label = tk.Label(self.__root, text="Score: 0",
+                                      font=(FONT, 16, "bold"), bg=BG_COLOR)
+
+        self.__end_frame = tk.Frame(self.__root, bg=BG_COLOR)
+        self.__end_label = tk.Label(self.__end_frame, text="",
+                                    font=(FONT, 14), bg=BG_COLOR)
+        self.__end_label.grid(row=0, column=0, columnspan=2)
+        self.__y_button = tk.Button(self.__end_frame, text='Yes!',
+                                    font=(FONT, 16),
+                                    command=self.__start_over, bg='cyan')
+        self.__y_button.grid(row=1, column=0)
+        self.__n_button = tk.Button(self.__end_frame, text='Nope',
+                                    font=(FONT, 16),
+                                    command=self.__exit_game, bg='cyan')
+        self.__n_button.grid(row=1, column=1)
+        self.__assets.play_music(LOBBY_BEFORE_START_PATH)
 
     def __buttons_from_letters(self, board) -> None:
         """
-        Function make buttons of all random letters in board.
+        Function puts the letters of the board on the board buttons. The
+        buttons are only made again if the board size changed.
         :param board: Board
         """
+        if len(self.__board_buttons) != len(board) or \
+                len(self.__board_buttons[0]) != len(board[0]):
+            for row_buttons in self.__board_buttons:
+                for button in row_buttons:
+                    button.destroy()
+            self.__board_buttons = []
+            for row in range(len(board)):
+                row_buttons = []
+                for col in range(len(board[0])):
+                    coord = (row, col)
+                    button = tk.Button(
+                        self.__board_frame, width=8, height=4,
+                        command=lambda c=coord: self.__add_letter(c))
+                    button.grid(row=row, column=col)
+                    row_buttons.append(button)
+                self.__board_buttons.append(row_buttons)
         for row in range(len(board)):
-            row_buttons = []
             for col in range(len(board[0])):
-                coord = (row, col)
-                button = tk.Button(self.__board_frame, text=board[row][col],
-                                   width=8, height=4,
-                                   command=lambda c=coord: self.__add_letter(c))
-                button.grid(row=row, column=col)
-                row_buttons.append(button)
-            self.__board_buttons.append(row_buttons)
+                self.__board_buttons[row][col].config(
+                    text=board[row][col], state=tk.NORMAL, bg="white")
 
     def __start_game(self) -> None:
         """
         Function update game with all widgets and tools needed for the game to
         run.
         """
-        self.__start_button.destroy()
-        mixer.Channel(0).play(mixer.Sound(GAME_PLAY_PATH), loops=-1)
+        self.__start_button.pack_forget()
+        self.__assets.play_music(GAME_PLAY_PATH)
 
-        self.__board_frame = tk.Frame(self.__root, width=400, height=400)
         self.__board_frame.pack()
-        self.__board_buttons = []
-        board = self.__boggle_board.get_board_copy()
-        self.__buttons_from_letters(board)
-        self.__word_entry = tk.Entry(self.__root, font=(FONT, 12, "bold"))
+        self.__buttons_from_letters(self.__boggle_board.get_board_copy())
+        self.__word_entry.delete(0, tk.END)
         self.__word_entry.pack()
-        self.__word_entry.bind('<KeyPress>', lambda x: 'break')
-        self.__submit_button = tk.Button(self.__root, image=self.__submit_pic,
-                                         command=self.__submit_words,
-                                         bg=BG_COLOR)
         self.__submit_button.pack()
         self.__submitted_words = []
-        self.__word_listbox = tk.Listbox(self.__root, height=17, width=25,
-                                         bg=BG_COLOR)
+        self.__clicked_cells.clear()
+        self.__enabled_cells = None
+        self.__hinted_cells = set()
+        self.__word_listbox.delete(0, tk.END)
         self.__word_listbox.place(x=500, y=31)
-        self.__invalid_word_label = tk.Label(self.__root, text="",
-                                             font=(FONT, 12),
-                                             bg=BG_COLOR)
+        self.__invalid_word_label.config(text="")
         self.__invalid_word_label.pack()
-        self.__score_label = tk.Label(self.__root, text="Score: 0",
-                                      font=(FONT, 16, "bold"), bg=BG_COLOR)
+        self.__score_label.config(text="Score: 0")
         self.__score_label.pack()
         self.__start_time = time.time()
         self.__update_timer()
@@ -142,10 +200,11 @@ class BoggleGUI:
         self.__timer_label.configure(text=timer_text)
 
         if remaining_time >= 1:
-            self.__root.after(1000 - (elapsed_time % 1000),
-                              self.__update_timer)
+            self.__timer_job = self.__root.after(1000 - (elapsed_time % 1000),
+                                                 self.__update_timer)
 
         else:
+            self.__timer_job = None
             self.__timer_label.configure(text="Time: 00:00")
             self.__end_game()
 
@@ -160,33 +219,46 @@ class BoggleGUI:
 
         button = self.__board_buttons[row][col]
         button.config(state=tk.DISABLED, bg="light gray")
-        self.__clicked_buttons.add(button)
-        self.__update_possible_buttons(coordinate)
+        self.__clicked_cells.add(coordinate)
         self.__boggle_board.add_coordinate(coordinate)
+        self.__update_possible_buttons(coordinate)
+        if not self.__boggle_board.is_current_path_prefix():
+            self.__invalid_word_label.config(text=DEAD_END)
         current_word = self.__word_entry.get()
         new_word = current_word + letter
         self.__word_entry.delete(0, tk.END)
         self.__word_entry.insert(tk.END, new_word)
 
-        mixer.music.load(POP_PATH)
-        mixer.music.play()
+        self.__assets.play_effect(POP_PATH)
 
     def __update_possible_buttons(self, coordinate: Coordinate) -> None:
         """
         Function receives an index of a button on the board and changes that
-        all the buttons next to it are gray and enabled and the other buttons
-        are white and disabled.
+        all the buttons next to it are enabled and the other buttons are white
+        and disabled. The enabled buttons that lead to a word are green and
+        the rest are gray. Only the buttons that change are configured.
         :param coordinate: coordinate indexes
         """
         next_moves = self.__boggle_board.get_next_possible_moves(coordinate)
-        for r in range(len(self.__board_buttons)):
-            for c in range(len(self.__board_buttons[0])):
-                button = self.__board_buttons[r][c]
-                if button not in self.__clicked_buttons:
-                    if (r, c) in next_moves:
-                        button.config(state=tk.NORMAL, bg="gray")
-                    else:
-                        button.config(state=tk.DISABLED, bg="white")
+        next_moves -= self.__clicked_cells
+        hinted_cells = self.__boggle_board.get_next_word_moves()
+        if self.__enabled_cells is None:
+            # On the first letter of a word every button changes
+            to_disable = {(r, c) for r in range(len(self.__board_buttons))
+                          for c in range(len(self.__board_buttons[0]))}
+            to_enable = next_moves
+        else:
+            to_disable = self.__enabled_cells - next_moves
+            to_enable = next_moves - self.__enabled_cells
+            # Cells that stay enabled but start or stop leading to a word
+            to_enable |= (hinted_cells ^ self.__hinted_cells) & next_moves
+        for r, c in to_disable - next_moves - self.__clicked_cells:
+            self.__board_buttons[r][c].config(state=tk.DISABLED, bg="white")
+        for r, c in to_enable:
+            color = HINT_COLOR if (r, c) in hinted_cells else "gray"
+            self.__board_buttons[r][c].config(state=tk.NORMAL, bg=color)
+        self.__enabled_cells = next_moves
+        self.__hinted_cells = hinted_cells
 
     def __submit_words(self) -> None:
         """
@@ -200,8 +272,7 @@ class BoggleGUI:
             # word is good
             self.__update_word_list()
             self.__invalid_word_label.config(text="")
-            mixer.music.load(random.choice(ICYTOWER_SOUNDS))
-            mixer.music.play()
+            self.__assets.play_effect(random.choice(ICYTOWER_SOUNDS))
             self.__score_label.config(text=f"Score: "
                                            f"{self.__boggle_board.get_score()}")
             if self.__boggle_board.is_max_score():
@@ -209,11 +280,12 @@ class BoggleGUI:
         else:
             # word is no good
             self.__invalid_word_label.config(text=INVALID_WORD)
-            mixer.music.load(INCORRECT_SOUND_PATH)
-            mixer.music.play()
+            self.__assets.play_effect(INCORRECT_SOUND_PATH)
 
         # reset the board so player can start look for other word.
-        self.__clicked_buttons.clear()
+        self.__clicked_cells.clear()
+        self.__enabled_cells = None
+        self.__hinted_cells = set()
         for row in self.__board_buttons:
             for button in row:
                 button.config(state=tk.NORMAL, bg="white")
@@ -226,42 +298,70 @@ class BoggleGUI:
 
     def __start_over(self) -> None:
         """
-        Function starts new game if player wants to.
+        Function starts new game if player wants to. The next board is
+        prepared by the pipeline during the game, if it isn't ready yet the
+        function checks again later instead of blocking the window.
         """
-        self.__root.destroy()
-        BoggleGUI(BoggleBoard())
+        if self.__pipeline is None:
+            self.__boggle_board.new_board()
+            next_board = self.__boggle_board
+        else:
+            next_board = self.__pipeline.get_ready_board()
+            if next_board is None:
+                self.__y_button.config(state=tk.DISABLED)
+                self.__end_label.config(text=PREPARING_BOARD)
+                self.__root.after(BOARD_CHECK_MS, self.__start_over)
+                return
+        self.new_game(next_board)
+
+    def new_game(self, boggle_board: BoggleBoard) -> None:
+        """
+        Function goes back to the start screen with a new board. The window,
+        its widgets, the sounds and the images are kept, only the board is
+        replaced.
+        :param boggle_board: The board of the next game
+        """
+        if self.__timer_job is not None:
+            self.__root.after_cancel(self.__timer_job)
+            self.__timer_job = None
+        self.__boggle_board = boggle_board
+        for widget in (self.__board_frame, self.__word_entry,
+                       self.__submit_button, self.__invalid_word_label,
+                       self.__score_label, self.__end_frame):
+            widget.pack_forget()
+        self.__word_listbox.place_forget()
+        self.__y_button.config(state=tk.NORMAL)
+        self.__timer_label.config(text="")
+        self.__start_button.pack(pady=200, padx=30, side=tk.TOP,
+                                 before=self.__timer_label)
+        self.__assets.play_music(LOBBY_BEFORE_START_PATH)
 
     def __exit_game(self) -> None:
         """
         Function exit game if player wants to.
         """
+        if self.__pipeline is not None:
+            self.__pipeline.stop()
         self.__root.destroy()
-        mixer.music.stop()
+        self.__assets.stop_all()
         quit()
 
     def __end_game(self) -> None:
         """
         Function handles the labels and widgets when the game ends.
         """
-        self.__board_frame.destroy()
-        self.__word_entry.destroy()
-        self.__submit_button.destroy()
-        end_frame = tk.Frame(self.__root, bg=BG_COLOR)
-        end_frame.pack()
-        end_text = self.__get_end_text()
-        self.__end_label = tk.Label(end_frame, text=end_text,
-                                    font=(FONT, 14), bg=BG_COLOR)
-        self.__end_label.grid(row=0, column=0, columnspan=2)
-        self.__y_button = tk.Button(end_frame, text='Yes!', font=(FONT, 16),
-                                    command=self.__start_over, bg='cyan')
-        self.__y_button.grid(row=1, column=0)
-        self.__n_button = tk.Button(end_frame, text='Nope', font=(FONT, 16),
-                                    command=self.__exit_game, bg='cyan')
-        self.__n_button.grid(row=1, column=1)
+        if self.__timer_job is not None:
+            # The game ended before the time was up
+            self.__root.after_cancel(self.__timer_job)
+            self.__timer_job = None
+        self.__board_frame.pack_forget()
+        self.__word_entry.pack_forget()
+        self.__submit_button.pack_forget()
+        self.__end_label.config(text=self.__get_end_text())
+        self.__end_frame.pack()
 
-        mixer.Channel(0).stop()
-        mixer.music.load(END_GAME_PATH)
-        mixer.music.play()
+        self.__assets.stop_music()
+        self.__assets.play_effect(END_GAME_PATH)
 
     def __get_end_text(self) -> str:
         """Function returns what end message to display when the game ends."""
@@ -274,4 +374,6 @@ class BoggleGUI:
 
 
 if __name__ == "__main__":
-    boggle_gui = BoggleGUI(BoggleBoard())
+    board_pipeline = BoardPipeline(pool=load_board_pool(),
+                                   words_range=GAME_WORDS_RANGE)
+    boggle_gui = BoggleGUI(board_pipeline.get_board(), board_pipeline)
@@ -0,0 +1,257 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from itertools import islice
+from typing import List, Dict, Iterable, Iterator, Optional, TextIO, Tuple
+
+import ex11_utils
+from boggle_board_randomizer import randomize_board, BOARD_SIZE
+from boggle_dictionary import load_dictionary, WORDS_PATH
+from boggle_parallel import ParallelSolver
+
+Board = List[List[str]]
+Path = List[Tuple[int, int]]
+
+PROGRESS_EVERY = 10000
+# Boards sent to the processes pool at once, so a long input is never
+# read into memory as a whole
+PARALLEL_BATCH_SIZE = 1024
+
+
+def parse_board(line: str) -> Board:
+    """
+    Function reads a board from a line of text. The line is either a JSON
+    list of rows, or rows of letters separated by spaces or '/', where 'QU'
+    is read as a single tile.
+    :param line: A line of text
+    :return: The game board
+    """
+    line = line.strip()
+    if line.startswith("["):
+        board = parse_json_board(json.loads(line), line)
+    else:
+        board = [parse_row(row) for row in line.replace("/", " ").split()]
+    if len(board) == 0 or len(board[0]) == 0 or \
+            any(len(row) != len(board[0]) for row in board):
+        raise ValueError(f"Not a rectangular board: {line!r}")
+    return board
+
+
+def parse_json_board(board: object, line: str) -> Board:
+    """
+    Function checks that a board read from JSON is a list of rows of tiles,
+    and makes its tiles upper case like the tiles of text rows.
+    :param board: The JSON value of the line
+    :param line: The line of text, for the error message
+    :return: The game board
+    """
+    if not isinstance(board, list) or \
+            not all(isinstance(row, list) for row in board):
+        raise ValueError(f"Not a list of rows: {line!r}")
+    if not all(isinstance(tile, str) and tile
+               for row in board for tile in row):
+        raise ValueError(f"Tiles must be non-empty strings: {line!r}")
+    return [[tile.upper() for tile in row] for row in board]
+
+
+def parse_row(row: str) -> List[str]:
+    """
+    Function splits a row of letters into tiles, keeping 'QU' together.
+    :param row: The letters of a row
+    :return: A list of the row tiles
+    """
+    tiles = []
+    i = 0
+    row = row.upper()
+    while i < len(row):
+        if row.startswith("QU", i):
+            tiles.append("QU")
+            i += 2
+        else:
+            tiles.append(row[i])
+            i += 1
+    return tiles
+
+
+def read_boards(file: TextIO) -> Iterator[Board]:
+    """
+    Function yields the boards of a file, one board per line. Empty lines
+    are skipped and lines that aren't boards are reported and skipped.
+    :param file: An open text file
+    :return: An iterator of the boards
+    """
+    for line_number, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        try:
+            yield parse_board(line)
+        except ValueError as error:
+            print(f"line {line_number}: {error}", file=sys.stderr)
+
+
+def generate_boards(count: Optional[int], size: int, seed: Optional[int]) \
+        -> Iterator[Board]:
+    """
+    Function yields random boards.
+    :param count: The number of boards, endless if None
+    :param size: The number of rows and columns of the boards
+    :param seed: The random seed, a random one if None
+    :return: An iterator of the boards
+    """
+    if seed is not None:
+        random.seed(seed)
+    boards_made = 0
+    while count is None or boards_made < count:
+        boards_made += 1
+        yield randomize_board(rows=size, cols=size)
+
+
+def solve_boards(boards: Iterable[Board], words_path: str,
+                 workers: Optional[int]) \
+        -> Iterator[Tuple[Board, Dict[str, Path]]]:
+    """
+    Function solves the boards one after the other, or in batches on a
+    processes pool if workers is given, and yields every board with its
+    solve_board result in the order of the boards.
+    :param boards: An iterable of boards
+    :param words_path: Path to the words file
+    :param workers: The number of processes, solve in this process if None
+    :return: An iterator of (board, solve_board result) tuples
+    """
+    if workers is None:
+        trie = load_dictionary(words_path)
+        for board in boards:
+            yield board, ex11_utils.solve_board(board, trie)
+        return
+
+    boards = iter(boards)
+    with ParallelSolver(words_path, workers) as solver:
+        while True:
+            batch = list(islice(boards, PARALLEL_BATCH_SIZE))
+            if not batch:
+                return
+            yield from zip(batch, solver.solve_boards(batch))
+
+
+def get_board_report(board: Board, board_words: Dict[str, Path],
+                     with_words: bool, with_paths: bool) -> Dict:
+    """
+    Function returns the analysis of a solved board.
+    :param board: A game board
+    :param board_words: The solve_board result of the board
+    :param with_words: True to include the words of the board
+    :param with_paths: True to include the max score path of every word
+    :return: A dict of the board analysis
+    """
+    report = {"board": board,
+              "max_score": ex11_utils.get_score(board_words.values()),
+              "word_count": len(board_words)}
+    if with_words:
+        report["words"] = list(board_words)
+    if with_paths:
+        report["paths"] = list(board_words.values())
+    return report
+
+
+def analyze(boards: Iterable[Board], output: TextIO, words_path: str,
+            workers: Optional[int], with_words: bool, with_paths: bool,
+            progress_every: int) -> int:
+    """
+    Function solves the boards and writes the analysis of every board as a
+    JSON line as soon as it is ready. The throughput is reported to stderr.
+    :param boards: An iterable of boards
+    :param output: The file to write the JSON lines to
+    :param words_path: Path to the words file
+    :param workers: The number of processes, solve in this process if None
+    :param with_words: True to include the words of every board
+    :param with_paths: True to include the paths of every board
+    :param progress_every: Report the throughput every this many boards
+    :return: The number of boards analyzed
+    """
+    start = time.perf_counter()
+    boards_count = 0
+    for board, board_words in solve_boards(boards, words_path, workers):
+        report = get_board_report(board, board_words, with_words, with_paths)
+        output.write(json.dumps(report, separators=(",", ":")) + "\n")
+        boards_count += 1
+        if progress_every and boards_count % progress_every == 0:
+            print_throughput(boards_count, time.perf_counter() - start)
+    print_throughput(boards_count, time.perf_counter() - start)
+    return boards_count
+
+
+def print_throughput(boards_count: int, seconds: float) -> None:
+    """
+    Function prints the number of boards analyzed and the boards per second
+    to stderr.
+    :param boards_count: The number of boards analyzed
+    :param seconds: The time since the analysis started
+    """
+    rate = boards_count / seconds if seconds else 0
+    print(f"{boards_count} boards in {seconds:.1f} s, {rate:.1f} boards/sec",
+          file=sys.stderr)
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    """
+    Function runs the command line tool.
+    :param args: The command line arguments, sys.argv if None
+    """
+    parser = argparse.ArgumentParser(
+        description="Solve Boggle boards and write the analysis of every "
+                    "board as a JSON line.")
+    parser.add_argument("input", nargs="?",
+                        help="file with a board on every line, '-' for "
+                             "stdin (the default unless --generate is given)")
+    parser.add_argument("--generate", type=int, metavar="COUNT",
+                        help="analyze COUNT random boards instead, 0 for "
+                             "endless")
+    parser.add_argument("--size", type=int, default=BOARD_SIZE,
+                        help="rows and columns of the random boards")
+    parser.add_argument("--seed", type=int, help="seed of the random boards")
+    parser.add_argument("--output", help="file to write to, stdout if not "
+                                         "given")
+    parser.add_argument("--words", default=WORDS_PATH,
+                        help="path to the words file")
+    parser.add_argument("--workers", type=int,
+                        help="solve on this many processes")
+    parser.add_argument("--no-words", action="store_true",
+                        help="don't include the words of every board")
+    parser.add_argument("--no-paths", action="store_true",
+                        help="don't include the paths of every board")
+    parser.add_argument("--progress-every", type=int, default=PROGRESS_EVERY,
+                        help="report the throughput every this many boards, "
+                             "0 to only report at the end")
+    args = parser.parse_args(args)
+
+    input_file = None
+    if args.generate is not None:
+        boards = generate_boards(args.generate or None, args.size, args.seed)
+    elif args.input in (None, "-"):
+        boards = read_boards(sys.stdin)
+    else:
+        input_file = open(args.input, "r")
+        boards = read_boards(input_file)
+    output = sys.stdout if args.output is None else open(args.output, "w")
+
+    try:
+        analyze(boards, output, args.words, args.workers, not args.no_words,
+                not args.no_paths, args.progress_every)
+    except BrokenPipeError:
+        # The reader of the output stopped reading, like head does. The
+        # output is pointed at devnull so flushing it on exit doesn't fail
+        # again.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    finally:
+        if input_file is not None:
+            input_file.close()
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
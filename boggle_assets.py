@@ -0,0 +1,195 @@
+import tkinter as tk
+from typing import Dict, List, Optional
+
+try:
+    import pygame
+    from pygame import mixer
+except ImportError:
+    # The game still runs without sound
+    pygame = None
+    mixer = None
+
+# Channel 0 plays the background music, the rest play the sound effects
+MUSIC_CHANNEL = 0
+EFFECT_CHANNELS = 6
+
+
+class MixerBackend:
+    """Plays sounds on the channels of the pygame mixer"""
+    def __init__(self, channels: int):
+        """
+        Initialize the mixer
+        :param channels: The number of channels to play on
+        """
+        mixer.init()
+        mixer.set_num_channels(channels)
+
+    def load(self, path: str) -> object:
+        """
+        Function decodes a sound file.
+        :param path: Path to the sound file
+        :return: The decoded sound
+        """
+        return mixer.Sound(path)
+
+    def play(self, sound: object, channel: int, loops: int = 0) -> None:
+        """
+        Function starts playing a sound on a channel, stopping what was
+        playing on it. Returns without waiting for the sound.
+        :param sound: A sound from load
+        :param channel: The channel number
+        :param loops: How many times to repeat the sound, -1 for forever
+        """
+        mixer.Channel(channel).play(sound, loops=loops)
+
+    def is_busy(self, channel: int) -> bool:
+        """
+        Function checks if a channel is playing.
+        :param channel: The channel number
+        :return: True if the channel is playing, False otherwise.
+        """
+        return mixer.Channel(channel).get_busy()
+
+    def stop(self, channel: int) -> None:
+        """
+        Function stops a channel.
+        :param channel: The channel number
+        """
+        mixer.Channel(channel).stop()
+
+
+class SilentBackend:
+    """A backend that plays nothing, for running without a sound device. It
+    keeps the last sound that would have been played and how many were."""
+    def __init__(self, channels: int):
+        """
+        Initialize the backend
+        :param channels: The number of channels to play on
+        """
+        self.last_played: Optional[str] = None
+        self.played_count = 0
+
+    def load(self, path: str) -> object:
+        """Returns the path as the sound"""
+        return path
+
+    def play(self, sound: object, channel: int, loops: int = 0) -> None:
+        """Function notes that the sound was played"""
+        self.last_played = sound
+        self.played_count += 1
+
+    def is_busy(self, channel: int) -> bool:
+        """Returns False, nothing is ever playing"""
+        return False
+
+    def stop(self, channel: int) -> None:
+        """Function does nothing, nothing is ever playing"""
+
+
+class AssetManager:
+    """Loads the sounds and images of the game once and keeps them, and
+    plays the sound effects on a pool of channels so a click never waits for
+    a sound file to be read and decoded."""
+    def __init__(self, silent: bool = False,
+                 effect_channels: int = EFFECT_CHANNELS):
+        """
+        Initialize the assets. The silent backend is used if silent is True
+        or there is no sound device.
+        :param silent: True to play no sound
+        :param effect_channels: The number of channels of the sound effects
+        """
+        self.__backend = None
+        if not silent and mixer is not None:
+            try:
+                self.__backend = MixerBackend(effect_channels + 1)
+            except pygame.error:
+                # There is no sound device
+                self.__backend = None
+        if self.__backend is None:
+            self.__backend = SilentBackend(effect_channels + 1)
+        self.__effect_channels = effect_channels
+        # The next effect channel to use when all of them are playing
+        self.__next_channel = 0
+        self.__sounds: Dict[str, object] = dict()
+        self.__images: Dict[str, tk.PhotoImage] = dict()
+
+    def get_backend(self) -> object:
+        """Returns the backend the sounds are played with"""
+        return self.__backend
+
+    def get_sound(self, path: str) -> object:
+        """
+        Function returns a decoded sound, decoding it the first time.
+        :param path: Path to the sound file
+        :return: The decoded sound
+        """
+        sound = self.__sounds.get(path)
+        if sound is None:
+            sound = self.__backend.load(path)
+            self.__sounds[path] = sound
+        return sound
+
+    def get_image(self, path: str) -> tk.PhotoImage:
+        """
+        Function returns an image, loading it the first time. Images can
+        only be loaded after the Tk root window is created.
+        :param path: Path to the image file
+        :return: The image
+        """
+        image = self.__images.get(path)
+        if image is None:
+            image = tk.PhotoImage(file=path)
+            self.__images[path] = image
+        return image
+
+    def preload_sounds(self, paths: List[str]) -> None:
+        """
+        Function decodes the given sounds now, so playing them later doesn't
+        wait for them.
+        :param paths: Paths to the sound files
+        """
+        for path in paths:
+            self.get_sound(path)
+
+    def play_music(self, path: str) -> None:
+        """
+        Function plays a sound over and over on the music channel, instead
+        of the music that was playing.
+        :param path: Path to the sound file
+        """
+        self.__backend.play(self.get_sound(path), MUSIC_CHANNEL, loops=-1)
+
+    def stop_music(self) -> None:
+        """Function stops the music"""
+        self.__backend.stop(MUSIC_CHANNEL)
+
+    def play_effect(self, path: str) -> None:
+        """
+        Function plays a sound once on a free effect channel. If all the
+        channels are playing, the one that started playing first is used.
+        :param path: Path to the sound file
+        """
+        sound = self.get_sound(path)
+        channel = self.__get_effect_channel()
+        self.__backend.play(sound, channel)
+
+    def __get_effect_channel(self) -> int:
+        """
+        Function picks the channel for the next effect.
+        :return: The channel number
+        """
+        for i in range(self.__effect_channels):
+            channel = MUSIC_CHANNEL + 1 + \
+                (self.__next_channel + i) % self.__effect_channels
+            if not self.__backend.is_busy(channel):
+                break
+        else:
+            channel = MUSIC_CHANNEL + 1 + self.__next_channel
+        self.__next_channel = (channel - MUSIC_CHANNEL) % \
+            self.__effect_channels
+        return channel
+
+    def stop_all(self) -> None:
+        """Function stops the music and all the effects"""
+        for channel in range(self.__effect_channels + 1):
+            self.__backend.stop(channel)
@@ -0,0 +1,401 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import List, Dict, Tuple, Optional, Callable
+
+import ex11_utils
+from boggle_board_randomizer import randomize_board
+from boggle_dictionary import load_dictionary, load_count_index
+
+WORDS_PATH = "boggle_dict.txt"
+DEFAULT_BOARDS = 50
+DEFAULT_SEED = 2023
+DEFAULT_SIZE = 6
+DEFAULT_BUDGET_MS = 100
+DEFAULT_BATCH_BOARDS = 200
+# Batch sizes compared as well as the given one, where a batch has the
+# least to share
+SMALL_BATCH_SIZES = [1, 5, 20]
+# The best time of this many runs is taken, so a pause of the machine
+# doesn't decide the comparison
+BATCH_REPEATS = 3
+SUITE_SIZES = [4, 5, 6]
+SUITE_BOARDS_PER_SIZE = 10
+SUITE_LENGTHS = range(3, 9)
+# Letters that build many words, for boards that are slow to solve
+DENSE_LETTERS = "AEIOSTRLNDE"
+SUITE_FUNCTIONS = ["find_length_n_paths", "find_length_n_words",
+                   "count_length_n_words", "max_score_paths",
+                   "is_valid_path"]
+
+Board = List[List[str]]
+
+
+def load_words(words_path: str = WORDS_PATH) -> List[str]:
+    """
+    Function loads the words list from the given file.
+    :param words_path: Path to the words file
+    :return: A list of words
+    """
+    with open(words_path, "r") as file:
+        return file.read().split()
+
+
+def measure_mode(boards: List[Board], tries: List[ex11_utils.WordTrie],
+                 mode: str) -> Dict[str, float]:
+    """
+    Function solves all the boards with max_score_paths in the given solver
+    mode and measures the time per board and the peak memory allocated
+    while solving a board.
+    :param boards: A list of game boards
+    :param tries: The words trie of every board
+    :param mode: ex11_utils.SIMPLE_MODE or ex11_utils.FAST_MODE
+    :return: A dict of the measurements
+    """
+    start = time.perf_counter()
+    for board, trie in zip(boards, tries):
+        ex11_utils.max_score_paths(board, trie, mode)
+    total_time = time.perf_counter() - start
+
+    # Memory is traced separately since tracing slows the solver down
+    peak_memory = 0
+    tracemalloc.start()
+    for board, trie in zip(boards, tries):
+        tracemalloc.reset_peak()
+        base_memory = tracemalloc.get_traced_memory()[0]
+        ex11_utils.max_score_paths(board, trie, mode)
+        peak_memory = max(peak_memory,
+                          tracemalloc.get_traced_memory()[1] - base_memory)
+    tracemalloc.stop()
+
+    return {"ms_per_board": 1000 * total_time / len(boards),
+            "peak_kib": peak_memory / 1024}
+
+
+def compare_modes(boards_count: int, seed: int) -> None:
+    """
+    Function compares the simple and fast solver modes on random boards and
+    prints the results.
+    :param boards_count: The number of random boards to solve
+    :param seed: The random seed used to create the boards
+    """
+    random.seed(seed)
+    boards = [randomize_board() for _ in range(boards_count)]
+    words = load_words()
+    # The words are filtered once per board so only the search is measured
+    tries = [ex11_utils.get_words_trie(board, words) for board in boards]
+
+    print(f"{boards_count} random boards, seed {seed}")
+    print(f"{'mode':<8}{'ms/board':>12}{'peak KiB':>12}")
+    for mode in (ex11_utils.SIMPLE_MODE, ex11_utils.FAST_MODE):
+        results = measure_mode(boards, tries, mode)
+        print(f"{mode:<8}{results['ms_per_board']:>12.3f}"
+              f"{results['peak_kib']:>12.1f}")
+
+
+def compare_batch(boards_count: int, seed: int) -> None:
+    """
+    Function compares solving random boards one by one with solve_board to
+    solving them together with solve_board_batch, for every kind of words
+    the solvers take and for small batches as well as the given one, and
+    prints the boards solved per second.
+    :param boards_count: The number of random boards in the biggest batch
+    :param seed: The random seed used to create the boards
+    """
+    random.seed(seed)
+    batch_sizes = sorted({size for size in SMALL_BATCH_SIZES
+                          if size < boards_count} | {boards_count})
+    boards = [randomize_board() for _ in range(boards_count)]
+    words_kinds = [("trie", load_dictionary(WORDS_PATH)),
+                   ("count index", load_count_index(WORDS_PATH)),
+                   ("word list", load_words())]
+
+    print(f"Batches of random boards, seed {seed}")
+    print(f"{'words':<14}{'boards':>8}{'boards/s':>12}"
+          f"{'batch boards/s':>16}")
+    for name, words in words_kinds:
+        for batch_size in batch_sizes:
+            batch = boards[:batch_size]
+            single_time = batch_time = float("inf")
+            for _ in range(BATCH_REPEATS):
+                start = time.perf_counter()
+                # The results are kept, like solve_board_batch keeps them
+                results = [ex11_utils.solve_board(board, words)
+                           for board in batch]
+                single_time = min(single_time, time.perf_counter() - start)
+                del results
+                start = time.perf_counter()
+                results = ex11_utils.solve_board_batch(batch, words)
+                batch_time = min(batch_time, time.perf_counter() - start)
+                del results
+            print(f"{name:<14}{batch_size:>8}"
+                  f"{batch_size / single_time:>12.1f}"
+                  f"{batch_size / batch_time:>16.1f}")
+
+
+def get_percentile(values: List[float], percent: float) -> float:
+    """
+    Function returns the given percentile of the values, using the nearest
+    rank.
+    :param values: A list of numbers
+    :param percent: The percentile, between 0 and 100
+    :return: The value at the percentile
+    """
+    ordered = sorted(values)
+    rank = max(int(round(percent / 100 * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def check_time_budget(size: int, boards_count: int, seed: int,
+                      budget_ms: float) -> bool:
+    """
+    Function solves random boards of the given size with max_score_paths on
+    the full dictionary and checks that every board is solved within the
+    time budget.
+    :param size: The number of rows and columns of the boards
+    :param boards_count: The number of random boards to solve
+    :param seed: The random seed used to create the boards
+    :param budget_ms: The maximal time to solve a board, in milliseconds
+    :return: True if all the boards were solved within the budget
+    """
+    random.seed(seed)
+    boards = [randomize_board(rows=size, cols=size)
+              for _ in range(boards_count)]
+    trie = load_dictionary(WORDS_PATH)
+
+    times = []
+    for board in boards:
+        start = time.perf_counter()
+        ex11_utils.max_score_paths(board, trie)
+        times.append(1000 * (time.perf_counter() - start))
+
+    within_budget = max(times) < budget_ms
+    print(f"{boards_count} random {size}x{size} boards, seed {seed}")
+    print(f"p50 {get_percentile(times, 50):.2f} ms, "
+          f"p95 {get_percentile(times, 95):.2f} ms, "
+          f"max {max(times):.2f} ms, budget {budget_ms:g} ms: "
+          f"{'OK' if within_budget else 'OVER BUDGET'}")
+    return within_budget
+
+
+def build_corpus(seed: int, boards_per_size: int, sizes: List[int]) \
+        -> List[Tuple[str, Board]]:
+    """
+    Function builds the fixed boards of the benchmark suite: random boards,
+    boards of letters that build many words, boards of 'QU' and vowels, and
+    boards of only 'E', in every given size.
+    :param seed: The random seed used to create the boards
+    :param boards_per_size: The number of random boards of every size
+    :param sizes: The numbers of rows and columns of the boards
+    :return: A list of (board name, board) tuples
+    """
+    random.seed(seed)
+    corpus = []
+    for size in sizes:
+        for i in range(boards_per_size):
+            corpus.append((f"random-{size}x{size}-{i}",
+                           randomize_board(rows=size, cols=size)))
+        corpus.append((f"dense-{size}x{size}",
+                       [[random.choice(DENSE_LETTERS) for _ in range(size)]
+                        for _ in range(size)]))
+        corpus.append((f"qu-heavy-{size}x{size}",
+                       [[random.choice(["QU", "QU", "A", "I", "E", "T"])
+                         for _ in range(size)] for _ in range(size)]))
+        corpus.append((f"all-e-{size}x{size}",
+                       [["E"] * size for _ in range(size)]))
+    return corpus
+
+
+def get_function_calls(function_name: str, board: Board,
+                       trie: ex11_utils.WordTrie, mode: str) \
+        -> List[Callable[[], int]]:
+    """
+    Function returns the calls the suite measures for a function on a
+    board. Every call returns the number of words it found or validated.
+    :param function_name: One of SUITE_FUNCTIONS
+    :param board: A game board
+    :param trie: The words trie
+    :param mode: The solver mode
+    :return: A list of calls without arguments
+    """
+    if function_name == "find_length_n_paths":
+        return [lambda n=n: len(ex11_utils.find_length_n_paths(n, board, trie,
+                                                              mode))
+                for n in SUITE_LENGTHS]
+    if function_name == "find_length_n_words":
+        return [lambda n=n: len(ex11_utils.find_length_n_words(n, board, trie,
+                                                              mode))
+                for n in SUITE_LENGTHS]
+    if function_name == "count_length_n_words":
+        # Counts the paths find_length_n_words returns, the mode isn't used
+        return [lambda n=n: sum(ex11_utils.count_length_n_words(
+                    n, board, trie).values())
+                for n in SUITE_LENGTHS]
+    if function_name == "max_score_paths":
+        return [lambda: len(ex11_utils.max_score_paths(board, trie, mode))]
+    paths = ex11_utils.max_score_paths(board, trie)
+    return [lambda path=path: int(ex11_utils.is_valid_path(board, path, trie)
+                                  is not None)
+            for path in paths]
+
+
+def measure_function(function_name: str,
+                     corpus: List[Tuple[str, Board]],
+                     trie: ex11_utils.WordTrie, mode: str) \
+        -> Dict[str, float]:
+    """
+    Function measures every call of a function on all the corpus boards.
+    :param function_name: One of SUITE_FUNCTIONS
+    :param corpus: The boards of the suite
+    :param trie: The words trie
+    :param mode: The solver mode
+    :return: A dict of the latency percentiles in milliseconds, the words
+    found per second and the peak memory of a call in KiB
+    """
+    calls = [call for _, board in corpus
+             for call in get_function_calls(function_name, board, trie, mode)]
+    times = []
+    words_count = 0
+    for call in calls:
+        start = time.perf_counter()
+        words_count += call()
+        times.append(time.perf_counter() - start)
+
+    # Memory is traced separately since tracing slows the calls down
+    peak_memory = 0
+    tracemalloc.start()
+    for call in calls:
+        tracemalloc.reset_peak()
+        base_memory = tracemalloc.get_traced_memory()[0]
+        call()
+        peak_memory = max(peak_memory,
+                          tracemalloc.get_traced_memory()[1] - base_memory)
+    tracemalloc.stop()
+
+    total_time = sum(times)
+    times_ms = [1000 * call_time for call_time in times]
+    return {"calls": len(calls),
+            "p50_ms": get_percentile(times_ms, 50),
+            "p90_ms": get_percentile(times_ms, 90),
+            "p99_ms": get_percentile(times_ms, 99),
+            "max_ms": max(times_ms),
+            "total_ms": 1000 * total_time,
+            "words_per_sec": words_count / total_time if total_time else 0,
+            "peak_kib": peak_memory / 1024}
+
+
+def run_suite(seed: int, boards_per_size: int, sizes: List[int],
+              modes: List[str]) -> Dict:
+    """
+    Function runs the benchmark suite on every solver mode.
+    :param seed: The random seed used to create the boards
+    :param boards_per_size: The number of random boards of every size
+    :param sizes: The numbers of rows and columns of the boards
+    :param modes: The solver modes to measure
+    :return: A dict of the suite details and the results of every mode and
+    function
+    """
+    corpus = build_corpus(seed, boards_per_size, sizes)
+    trie = load_dictionary(WORDS_PATH)
+    results = []
+    for mode in modes:
+        for function_name in SUITE_FUNCTIONS:
+            measurements = measure_function(function_name, corpus, trie, mode)
+            results.append(dict(mode=mode, function=function_name,
+                                **measurements))
+    return {"seed": seed, "boards": len(corpus), "sizes": sizes,
+            "python": platform.python_version(),
+            "machine": platform.machine(), "results": results}
+
+
+def print_suite(suite: Dict, baseline: Optional[Dict] = None) -> None:
+    """
+    Function prints the suite results as a table. If baseline results are
+    given, it also prints how many times faster every function is now.
+    :param suite: The results of run_suite
+    :param baseline: Earlier results of run_suite to compare to, or None
+    """
+    baseline_results = dict()
+    if baseline is not None:
+        baseline_results = {(result["mode"], result["function"]): result
+                            for result in baseline["results"]}
+    print(f"{suite['boards']} boards, seed {suite['seed']}")
+    print(f"{'mode':<8}{'function':<22}{'p50 ms':>9}{'p90 ms':>9}"
+          f"{'p99 ms':>9}{'words/s':>11}{'peak KiB':>10}"
+          f"{'speedup' if baseline_results else '':>9}")
+    for result in suite["results"]:
+        line = (f"{result['mode']:<8}{result['function']:<22}"
+                f"{result['p50_ms']:>9.3f}{result['p90_ms']:>9.3f}"
+                f"{result['p99_ms']:>9.3f}{result['words_per_sec']:>11.0f}"
+                f"{result['peak_kib']:>10.1f}")
+        old = baseline_results.get((result["mode"], result["function"]))
+        if old is not None and result["total_ms"]:
+            line += f"{old['total_ms'] / result['total_ms']:>8.2f}x"
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Boggle solver benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    modes_parser = subparsers.add_parser(
+        "modes", help="compare the solver modes on random 4x4 boards")
+    modes_parser.add_argument("--boards", type=int, default=DEFAULT_BOARDS)
+    modes_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+
+    batch_parser = subparsers.add_parser(
+        "batch", help="compare solving random 4x4 boards one by one and "
+                      "together")
+    batch_parser.add_argument("--boards", type=int,
+                              default=DEFAULT_BATCH_BOARDS)
+    batch_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+
+    budget_parser = subparsers.add_parser(
+        "budget", help="check the solve time of random boards of a size")
+    budget_parser.add_argument("--size", type=int, default=DEFAULT_SIZE)
+    budget_parser.add_argument("--boards", type=int, default=DEFAULT_BOARDS)
+    budget_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    budget_parser.add_argument("--budget-ms", type=float,
+                               default=DEFAULT_BUDGET_MS)
+
+    suite_parser = subparsers.add_parser(
+        "suite", help="measure every solver function on a fixed corpus")
+    suite_parser.add_argument("--boards", type=int,
+                              default=SUITE_BOARDS_PER_SIZE,
+                              help="random boards of every size")
+    suite_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    suite_parser.add_argument("--sizes", type=int, nargs="+",
+                              default=SUITE_SIZES)
+    suite_parser.add_argument("--modes", nargs="+",
+                              default=[ex11_utils.FAST_MODE],
+                              choices=[ex11_utils.SIMPLE_MODE,
+                                       ex11_utils.FAST_MODE])
+    suite_parser.add_argument("--output", help="save the results as JSON")
+    suite_parser.add_argument("--baseline",
+                              help="JSON results of an earlier run to "
+                                   "compare to")
+
+    args = parser.parse_args()
+    if args.command == "modes":
+        compare_modes(args.boards, args.seed)
+    elif args.command == "batch":
+        compare_batch(args.boards, args.seed)
+    elif args.command == "budget":
+        if not check_time_budget(args.size, args.boards, args.seed,
+                                 args.budget_ms):
+            sys.exit(1)
+    else:
+        suite_results = run_suite(args.seed, args.boards, args.sizes,
+                                  args.modes)
+        baseline_results = None
+        if args.baseline:
+            with open(args.baseline, "r") as baseline_file:
+                baseline_results = json.load(baseline_file)
+        print_suite(suite_results, baseline_results)
+        if args.output:
+            with open(args.output, "w") as output_file:
+                json.dump(suite_results, output_file, indent=2)
@@ -5,7 +5,7 @@
 # DESCRIPTION:A helper file for ex11 that randomizes a Boggle board
 ##############################################################################
 import random
-from typing import List
+from typing import List, Optional
 
 
 BOARD_SIZE = 4
@@ -27,23 +27,79 @@ LETTERS = [
     ['T', 'E', 'R', 'W', 'H', 'V'],
     ['N', 'U', 'I', 'H', 'M', 'QU']
 ]
+# The 25 dice of Big Boggle, for 5x5 boards
+BIG_LETTERS = [
+    ['A', 'A', 'A', 'F', 'R', 'S'],
+    ['A', 'A', 'E', 'E', 'E', 'E'],
+    ['A', 'A', 'F', 'I', 'R', 'S'],
+    ['A', 'D', 'E', 'N', 'N', 'N'],
+    ['A', 'E', 'E', 'E', 'E', 'M'],
+    ['A', 'E', 'E', 'G', 'M', 'U'],
+    ['A', 'E', 'G', 'M', 'N', 'N'],
+    ['A', 'F', 'I', 'R', 'S', 'Y'],
+    ['B', 'J', 'K', 'QU', 'X', 'Z'],
+    ['C', 'C', 'E', 'N', 'S', 'T'],
+    ['C', 'E', 'I', 'I', 'L', 'T'],
+    ['C', 'E', 'I', 'L', 'P', 'T'],
+    ['C', 'E', 'I', 'P', 'S', 'T'],
+    ['D', 'D', 'H', 'N', 'O', 'T'],
+    ['D', 'H', 'H', 'L', 'O', 'R'],
+    ['D', 'H', 'L', 'N', 'O', 'R'],
+    ['D', 'H', 'L', 'N', 'O', 'R'],
+    ['E', 'I', 'I', 'I', 'T', 'T'],
+    ['E', 'M', 'O', 'T', 'T', 'T'],
+    ['E', 'N', 'S', 'S', 'S', 'U'],
+    ['F', 'I', 'P', 'R', 'S', 'Y'],
+    ['G', 'O', 'R', 'R', 'V', 'W'],
+    ['I', 'P', 'R', 'R', 'R', 'Y'],
+    ['N', 'O', 'O', 'T', 'U', 'W'],
+    ['O', 'O', 'O', 'T', 'T', 'U']
+]
+DICE_SETS = [LETTERS, BIG_LETTERS]
+
+
+def get_dice_set(cells: int) -> List[List[str]]:
+    """
+    Returns the smallest dice set with a die for every cell of the board,
+    or the biggest dice set if there isn't one.
+    :param cells: The number of cells in the board.
+    :return: 2-dimensional list of letters of the dice set.
+    """
+    for dice_list in DICE_SETS:
+        if len(dice_list) >= cells:
+            return dice_list
+    return DICE_SETS[-1]
 
 
-def randomize_board(dice_list: List[List[str]] = LETTERS) -> List[List[str]]:
+def randomize_board(dice_list: Optional[List[List[str]]] = None,
+                    rows: int = BOARD_SIZE, cols: int = BOARD_SIZE,
+                    rng: random.Random = random) -> List[List[str]]:
     """
-    Creates a random Boggle board.
+    Creates a random Boggle board. If the board has more cells than there
+    are dice, the dice are shuffled and rolled again for the rest.
     :param dice_list: 2-dimensional list of letters to generate the board from.
+    The dice set of the board size is used if None.
+    :param rows: The number of rows in the board.
+    :param cols: The number of columns in the board.
+    :param rng: The random generator to roll with.
     :return: a 2D list of strings representing a random Boggle board.
     """
-    dice_indices = list(range(len(dice_list)))
-    random.shuffle(dice_indices)
+    if dice_list is None:
+        dice_list = get_dice_set(rows * cols)
+    if len(dice_list) == 0:
+        raise ValueError("Can't randomize a board without dice")
+    dice_indices = []
+    while len(dice_indices) < rows * cols:
+        shuffled_indices = list(range(len(dice_list)))
+        rng.shuffle(shuffled_indices)
+        dice_indices.extend(shuffled_indices)
     dice_indices_iter = iter(dice_indices)
     board = []
-    for i in range(BOARD_SIZE):
+    for i in range(rows):
         row = []
-        for j in range(BOARD_SIZE):
+        for j in range(cols):
             die = dice_list[next(dice_indices_iter)]
-            letter = random.choice(die)
+            letter = rng.choice(die)
             row.append(letter)
         board.append(row)
     return board
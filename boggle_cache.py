@@ -0,0 +1,269 @@
+import pickle
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple, Hashable
+
+import ex11_utils
+from boggle_compact import CellsPath, MAX_BYTE_CELLS, encode_array_path
+from boggle_dictionary import load_dictionary, get_source_hash, WORDS_PATH
+from boggle_files import atomic_write
+
+Board = List[List[str]]
+Path = List[Tuple[int, int]]
+BoardKey = Tuple[Tuple[str, ...], ...]
+
+MAX_BOARDS = 4096
+CACHE_VERSION = 1
+
+# The 8 symmetries of a board with the given rows and cols, as functions of
+# (row, col) to the (row, col) in the transformed board and whether the
+# transformed board has its rows and cols swapped
+SYMMETRIES = [
+    (lambda r, c, rows, cols: (r, c), False),
+    (lambda r, c, rows, cols: (c, rows - 1 - r), True),
+    (lambda r, c, rows, cols: (rows - 1 - r, cols - 1 - c), False),
+    (lambda r, c, rows, cols: (cols - 1 - c, r), True),
+    (lambda r, c, rows, cols: (r, cols - 1 - c), False),
+    (lambda r, c, rows, cols: (rows - 1 - r, c), False),
+    (lambda r, c, rows, cols: (c, r), True),
+    (lambda r, c, rows, cols: (cols - 1 - c, rows - 1 - r), True),
+]
+
+# The cell maps of every symmetry, built once for every (rows, cols)
+_symmetry_maps: Dict[Tuple[int, int], List[Tuple[List[int], int]]] = dict()
+
+
+def get_symmetry_maps(rows: int, cols: int) -> List[Tuple[List[int], int]]:
+    """
+    Function returns the 8 symmetries of a board size as cell maps.
+    :param rows: The number of rows in the board
+    :param cols: The number of columns in the board
+    :return: A list of (cell map, transformed cols) tuples, where the cell
+    map has the index in the flattened transformed board of every cell of
+    the flattened board.
+    """
+    maps = _symmetry_maps.get((rows, cols))
+    if maps is not None:
+        return maps
+    maps = []
+    for transform, swaps in SYMMETRIES:
+        new_cols = rows if swaps else cols
+        cell_map = []
+        for row in range(rows):
+            for col in range(cols):
+                new_row, new_col = transform(row, col, rows, cols)
+                cell_map.append(new_row * new_cols + new_col)
+        maps.append((cell_map, new_cols))
+    _symmetry_maps[(rows, cols)] = maps
+    return maps
+
+
+def get_canonical_form(board: Board) -> Tuple[BoardKey, List[int]]:
+    """
+    Function finds the canonical form of a board: the smallest of the
+    boards it turns into by rotating and reflecting it. Boards with the same
+    canonical form have the same words.
+    :param board: A game board
+    :return: A tuple of the canonical board as a tuple of rows, and the
+    index in the flattened canonical board of every cell of the flattened
+    board.
+    """
+    rows, cols = len(board), len(board[0])
+    tiles = [tile for row in board for tile in row]
+    best = None
+    for cell_map, new_cols in get_symmetry_maps(rows, cols):
+        new_tiles = [""] * len(tiles)
+        for cell, new_cell in enumerate(cell_map):
+            new_tiles[new_cell] = tiles[cell]
+        key = tuple(tuple(new_tiles[i:i + new_cols])
+                    for i in range(0, len(new_tiles), new_cols))
+        if best is None or key < best[0]:
+            best = (key, cell_map)
+    return best
+
+
+class SolverCache:
+    """Remembers the solved boards, so a board that was solved before, or a
+    rotation or reflection of it, isn't solved again. The results are kept
+    for the canonical form of every board and turned back to the board of
+    the caller. A result from the cache has the same words and scores as
+    solving the board, but when paths are equally long the one given may be
+    different, and so may the order of the results."""
+    def __init__(self, words_path: str = WORDS_PATH,
+                 max_boards: int = MAX_BOARDS,
+                 cache_path: Optional[str] = None):
+        """
+        Initialize the cache, loading the saved results if cache_path exists
+        and was saved with the same words file
+        :param words_path: Path to the words file
+        :param max_boards: The number of results to keep, the least recently
+        used are removed first
+        :param cache_path: A file to load the results from and save them
+        to, results are only kept in memory if None
+        """
+        self.__words_path = words_path
+        self.__words = load_dictionary(words_path)
+        self.__max_boards = max_boards
+        self.__cache_path = cache_path
+        self.__results: "OrderedDict[Hashable, object]" = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        if cache_path is not None:
+            self.__load()
+
+    def __load(self) -> None:
+        """
+        Function loads the saved results. A file that can't be read or was
+        saved for another words file is ignored.
+        """
+        try:
+            with open(self.__cache_path, "rb") as file:
+                data = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return
+        if not isinstance(data, dict) or \
+                data.get("version") != CACHE_VERSION or \
+                data.get("words_hash") != get_source_hash(self.__words_path):
+            return
+        for key, result in data["results"]:
+            self.__store(key, result)
+
+    def save(self) -> None:
+        """Function saves the results to cache_path, if it was given"""
+        if self.__cache_path is None:
+            return
+        data = {"version": CACHE_VERSION,
+                "words_hash": get_source_hash(self.__words_path),
+                "results": list(self.__results.items())}
+        atomic_write(self.__cache_path,
+                     [pickle.dumps(data, pickle.HIGHEST_PROTOCOL)])
+
+    def __lookup(self, key: Hashable) -> Optional[object]:
+        """
+        Function returns a result and marks it as the most recently used.
+        :param key: The key of the result
+        :return: The result, None if it isn't in the cache
+        """
+        result = self.__results.get(key)
+        if result is None:
+            self.__misses += 1
+            return None
+        self.__hits += 1
+        self.__results.move_to_end(key)
+        return result
+
+    def __store(self, key: Hashable, result: object) -> None:
+        """
+        Function adds a result, removing the least recently used results if
+        the cache is full.
+        :param key: The key of the result
+        :param result: The result
+        """
+        self.__results[key] = result
+        self.__results.move_to_end(key)
+        while len(self.__results) > self.__max_boards:
+            self.__results.popitem(last=False)
+            self.__evictions += 1
+
+    def solve_board(self, board: Board) -> Dict[str, Path]:
+        """
+        Function returns ex11_utils.solve_board of the board.
+        :param board: A game board
+        :return: A dict of every word on the board and its longest path
+        """
+        if len(board) == 0 or len(board[0]) == 0:
+            return dict()
+        canonical, cell_map = get_canonical_form(board)
+        key = ("solve_board", canonical)
+        cols = len(board[0])
+        result = self.__lookup(key)
+        if result is not None:
+            board_cells = invert_cell_map(cell_map)
+            return {word: get_caller_path(cells, board_cells, cols)
+                    for word, cells in result}
+        board_words = ex11_utils.solve_board(board, self.__words)
+        self.__store(key, tuple((word, get_canonical_cells(path, cell_map,
+                                                           cols))
+                                for word, path in board_words.items()))
+        return board_words
+
+    def max_score_paths(self, board: Board) -> List[Path]:
+        """
+        Function returns ex11_utils.max_score_paths of the board.
+        :param board: A game board
+        :return: A list of paths that yield the highest score
+        """
+        return list(self.solve_board(board).values())
+
+    def find_length_n_words(self, n: int, board: Board) -> List[Path]:
+        """
+        Function returns ex11_utils.find_length_n_words of the board.
+        :param n: The length of the words
+        :param board: A game board
+        :return: A list of the paths of all the words of length n
+        """
+        if len(board) == 0 or len(board[0]) == 0:
+            return []
+        canonical, cell_map = get_canonical_form(board)
+        key = ("find_length_n_words", n, canonical)
+        cols = len(board[0])
+        result = self.__lookup(key)
+        if result is not None:
+            board_cells = invert_cell_map(cell_map)
+            return [get_caller_path(cells, board_cells, cols)
+                    for cells in result]
+        paths = ex11_utils.find_length_n_words(n, board, self.__words)
+        self.__store(key, tuple(get_canonical_cells(path, cell_map, cols)
+                                for path in paths))
+        return paths
+
+    def get_stats(self) -> Dict[str, int]:
+        """Returns the hits, misses, evictions and size of the cache"""
+        return {"hits": self.__hits, "misses": self.__misses,
+                "evictions": self.__evictions, "size": len(self.__results)}
+
+    def clear(self) -> None:
+        """Function removes all the results and resets the counters"""
+        self.__results.clear()
+        self.__hits = self.__misses = self.__evictions = 0
+
+
+def get_canonical_cells(path: Path, cell_map: List[int],
+                        cols: int) -> CellsPath:
+    """
+    Function turns a path on a board into cell indexes of its canonical
+    form.
+    :param path: A path of coordinates on the board
+    :param cell_map: The canonical cell of every cell of the board
+    :param cols: The number of columns in the board
+    :return: The path as encoded cell indexes of the canonical board
+    """
+    cells = [cell_map[row * cols + col] for row, col in path]
+    if len(cell_map) <= MAX_BYTE_CELLS:
+        return bytes(cells)
+    return encode_array_path(cells)
+
+
+def invert_cell_map(cell_map: List[int]) -> List[int]:
+    """
+    Function inverts the cell map of a board to its canonical form.
+    :param cell_map: The canonical cell of every cell of the board
+    :return: The cell of the board of every canonical cell
+    """
+    board_cells = [0] * len(cell_map)
+    for cell, canonical_cell in enumerate(cell_map):
+        board_cells[canonical_cell] = cell
+    return board_cells
+
+
+def get_caller_path(cells: CellsPath, board_cells: List[int],
+                    cols: int) -> Path:
+    """
+    Function turns cell indexes of a canonical board back into a path on a
+    board with that canonical form.
+    :param cells: The path as encoded cell indexes of the canonical board
+    :param board_cells: The cell of the board of every canonical cell
+    :param cols: The number of columns in the board
+    :return: The path as coordinates on the board
+    """
+    return [divmod(board_cells[cell], cols) for cell in cells]
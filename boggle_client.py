@@ -0,0 +1,187 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+from boggle_benchmark import get_percentile
+from boggle_server import BoggleServer, HOST, PORT
+from ex11_utils import DIRECTIONS
+
+Board = List[List[str]]
+Coordinate = Tuple[int, int]
+
+DEFAULT_CLIENTS = 50
+DEFAULT_DURATION = 10
+DEFAULT_PLAYERS_PER_GAME = 2
+MIN_WORD_PATH = 3
+MAX_WORD_PATH = 6
+
+
+class BoggleClient:
+    """A client of the Boggle server. Requests are sent one at a time and
+    every request waits for its response."""
+    def __init__(self):
+        """
+        Initialize the client, connect must be called before any request
+        """
+        self.__reader: Optional[asyncio.StreamReader] = None
+        self.__writer: Optional[asyncio.StreamWriter] = None
+        self.__request_id = 0
+
+    async def connect(self, host: str = HOST, port: int = PORT) -> None:
+        """
+        Function connects to the server.
+        :param host: The address of the server
+        :param port: The port of the server
+        """
+        self.__reader, self.__writer = await asyncio.open_connection(host,
+                                                                     port)
+
+    async def close(self) -> None:
+        """Function disconnects from the server"""
+        if self.__writer is not None:
+            self.__writer.close()
+            await self.__writer.wait_closed()
+
+    async def request(self, op: str, **fields) -> Dict:
+        """
+        Function sends a request and returns its response.
+        :param op: The operation of the request
+        :param fields: The other fields of the request
+        :return: The response of the server
+        """
+        self.__request_id += 1
+        request = dict(fields, op=op, id=self.__request_id)
+        self.__writer.write(json.dumps(request).encode() + b"\n")
+        await self.__writer.drain()
+        return json.loads(await self.__reader.readline())
+
+
+def get_random_path(board: Board) -> List[Coordinate]:
+    """
+    Function returns a random path on the board, as a player might try.
+    :param board: A game board
+    :return: A path of coordinates
+    """
+    rows, cols = len(board), len(board[0])
+    path = [(random.randrange(rows), random.randrange(cols))]
+    for _ in range(random.randint(MIN_WORD_PATH, MAX_WORD_PATH) - 1):
+        row, col = path[-1]
+        moves = [(row + dy, col + dx) for dy, dx in DIRECTIONS
+                 if 0 <= row + dy < rows and 0 <= col + dx < cols and
+                 (row + dy, col + dx) not in path]
+        if not moves:
+            break
+        path.append(random.choice(moves))
+    return path
+
+
+async def timed_request(client: BoggleClient, latencies: List[float],
+                        op: str, **fields) -> Dict:
+    """
+    Function sends a request and records how long it took to answer.
+    :param client: A connected client
+    :param latencies: The list to add the latency to, in milliseconds
+    :param op: The operation of the request
+    :param fields: The other fields of the request
+    :return: The response of the server
+    """
+    start = time.perf_counter()
+    response = await client.request(op, **fields)
+    latencies.append(1000 * (time.perf_counter() - start))
+    return response
+
+
+async def play_games(host: str, port: int, deadline: float,
+                     players_per_game: int, latencies: List[float]) -> None:
+    """
+    Function plays games on one connection until the deadline: it starts a
+    game, joins more players to its board, and submits random paths for
+    all of them.
+    :param host: The address of the server
+    :param port: The port of the server
+    :param deadline: The time.perf_counter time to stop at
+    :param players_per_game: The number of sessions on every board
+    :param latencies: The list to add the latencies to, in milliseconds
+    """
+    client = BoggleClient()
+    await client.connect(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            game = await timed_request(client, latencies, "new_game")
+            sessions = [game["session"]]
+            for _ in range(players_per_game - 1):
+                joined = await timed_request(client, latencies, "join_game",
+                                             session=game["session"])
+                sessions.append(joined["session"])
+            over = False
+            while not over and time.perf_counter() < deadline:
+                for session in sessions:
+                    for row, col in get_random_path(game["board"]):
+                        await timed_request(client, latencies,
+                                            "add_coordinate", session=session,
+                                            row=row, col=col)
+                    response = await timed_request(client, latencies,
+                                                   "add_submitted_word",
+                                                   session=session)
+                    over = over or not response["ok"] or response["over"]
+            for session in sessions:
+                await timed_request(client, latencies, "end_game",
+                                    session=session)
+    finally:
+        await client.close()
+
+
+async def run_load(host: str, port: int, clients: int, duration: float,
+                   players_per_game: int, start_server: bool) -> None:
+    """
+    Function runs many clients against the server at once and prints the
+    requests per second and the latency percentiles.
+    :param host: The address of the server
+    :param port: The port of the server
+    :param clients: The number of connections
+    :param duration: The seconds to run for
+    :param players_per_game: The number of sessions on every board
+    :param start_server: True to start a server in this process first
+    """
+    server = None
+    if start_server:
+        server = BoggleServer(host, 0)
+        host, port = await server.start()
+    latencies = []
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(play_games(host, port, start + duration,
+                                          players_per_game, latencies)
+                               for _ in range(clients)))
+    finally:
+        if server is not None:
+            await server.stop()
+    seconds = time.perf_counter() - start
+    print(f"{clients} clients, {len(latencies)} requests in {seconds:.1f} s, "
+          f"{len(latencies) / seconds:.0f} requests/sec")
+    if latencies:
+        print(f"latency p50 {get_percentile(latencies, 50):.2f} ms, "
+              f"p90 {get_percentile(latencies, 90):.2f} ms, "
+              f"p99 {get_percentile(latencies, 99):.2f} ms, "
+              f"max {max(latencies):.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generate load on a Boggle game server")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--clients", type=int, default=DEFAULT_CLIENTS)
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION,
+                        help="seconds to run for")
+    parser.add_argument("--players-per-game", type=int,
+                        default=DEFAULT_PLAYERS_PER_GAME)
+    parser.add_argument("--start-server", action="store_true",
+                        help="start a server in this process instead of "
+                             "connecting to a running one")
+    args = parser.parse_args()
+    asyncio.run(run_load(args.host, args.port, args.clients, args.duration,
+                         args.players_per_game, args.start_server))
@@ -0,0 +1,102 @@
+import sys
+from array import array
+from typing import Dict, Iterable, List, Tuple, Union
+
+Board = List[List[str]]
+Path = List[Tuple[int, int]]
+# A path as the indexes of its cells in the flattened board
+CellsPath = Union[bytes, array]
+
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1),
+              (1, 1)]
+
+# Boards with up to this many cells have paths of one byte per cell
+MAX_BYTE_CELLS = 256
+
+# The adjacency of a board depends only on its size, so it is built once
+# for every (rows, cols) and shared by all the boards of that size
+_neighbors_tables: Dict[Tuple[int, int], List[List[Tuple[int, int]]]] = \
+    dict()
+_neighbor_masks: Dict[Tuple[int, int], List[int]] = dict()
+
+
+def get_neighbors_table(rows: int, cols: int) -> List[List[Tuple[int, int]]]:
+    """
+    Function returns for every cell of a board of the given size (by its
+    index in the flattened board) the cells next to it, in the order of
+    DIRECTIONS. The table is shared and must not be changed.
+    :param rows: The number of rows in the board
+    :param cols: The number of columns in the board
+    :return: A list of (cell index, cell bit) pairs for every cell
+    """
+    neighbors = _neighbors_tables.get((rows, cols))
+    if neighbors is not None:
+        return neighbors
+    neighbors = []
+    for row in range(rows):
+        for col in range(cols):
+            cell_neighbors = []
+            for dy, dx in DIRECTIONS:
+                new_row, new_col = row + dy, col + dx
+                if 0 <= new_row < rows and 0 <= new_col < cols:
+                    cell = new_row * cols + new_col
+                    cell_neighbors.append((cell, 1 << cell))
+            neighbors.append(cell_neighbors)
+    _neighbors_tables[(rows, cols)] = neighbors
+    return neighbors
+
+
+def get_neighbor_masks(rows: int, cols: int) -> List[int]:
+    """
+    Function returns for every cell of a board of the given size (by its
+    index in the flattened board) a bitmask of the cells next to it, where
+    the bit of cell i is 1 << i. The list is shared and must not be changed.
+    :param rows: The number of rows in the board
+    :param cols: The number of columns in the board
+    :return: A list of the neighbors bitmask of every cell
+    """
+    masks = _neighbor_masks.get((rows, cols))
+    if masks is None:
+        masks = [sum(bit for _, bit in cell_neighbors)
+                 for cell_neighbors in get_neighbors_table(rows, cols)]
+        _neighbor_masks[(rows, cols)] = masks
+    return masks
+
+
+def encode_array_path(cells: Iterable[int]) -> array:
+    """
+    Function encodes a path of a board too big for one byte per cell.
+    :param cells: The path as cell indexes
+    :return: The path as an array of 2 byte cell indexes
+    """
+    return array("H", cells)
+
+
+class CompactBoard:
+    """The board as the solver uses it: the tiles of the flattened board and
+    the neighbors table of its size. Paths are kept as bytes of cell indexes
+    (or an array for very big boards) and only turned into lists of
+    coordinates when they are returned to the caller."""
+    __slots__ = ("rows", "cols", "tiles", "neighbors", "encode_path")
+
+    def __init__(self, board: Board):
+        """
+        Initialize the compact board
+        :param board: A game board
+        """
+        self.rows = len(board)
+        self.cols = len(board[0]) if self.rows else 0
+        # Interned, so equal tiles are one string
+        self.tiles = [sys.intern(tile) for row in board for tile in row]
+        self.neighbors = get_neighbors_table(self.rows, self.cols)
+        self.encode_path = bytes if len(self.tiles) <= MAX_BYTE_CELLS \
+            else encode_array_path
+
+    def decode_path(self, cells: Iterable[int]) -> Path:
+        """
+        Function turns a path of cell indexes into a path of coordinates.
+        :param cells: The path as cell indexes
+        :return: The path as a list of (row, col) coordinates
+        """
+        cols = self.cols
+        return [divmod(cell, cols) for cell in cells]
@@ -0,0 +1,505 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, List, Optional, Tuple, Iterable, Set
+
+from boggle_files import atomic_write
+from boggle_trie import WordTrie, TrieNode
+
+WORDS_PATH = "boggle_dict.txt"
+COMPILED_EXTENSION = ".trie"
+COMPILED_MAGIC = b"BOGTRIE" + (b"L" if sys.byteorder == "little" else b"B")
+COMPILED_VERSION = 1
+# magic, version, source size, source mtime, source sha256, nodes count,
+# edges count, words count, longest word length
+HEADER_FORMAT = "=8sIQQ32sIIII"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+UINT_SIZE = 4
+
+# Every letter has a bit in a letters signature. 'QU' together uses the bit
+# of 'Q', since that is how the 'QU' die face builds it, and a 'Q' that is
+# not followed by 'U' has a bit of its own.
+LETTER_BITS = {chr(ord("A") + i): 1 << i for i in range(26)}
+QU_BIT = LETTER_BITS["Q"]
+LONE_Q_BIT = 1 << 26
+OTHER_BIT = 1 << 27
+SIGNATURE_BITS = dict(LETTER_BITS, Q=LONE_Q_BIT, q=QU_BIT)
+
+# The dictionaries loaded in this process, by the absolute words file path
+_loaded_dictionaries: Dict[str, WordTrie] = dict()
+_loaded_letter_indexes: Dict[str, "LetterIndex"] = dict()
+_loaded_count_indexes: Dict[str, "LetterCountIndex"] = dict()
+
+
+def load_dictionary(words_path: str = WORDS_PATH) -> WordTrie:
+    """
+    Function returns the words trie of the given words file. The trie is
+    built once per process and shared by everyone who loads it. It is also
+    compiled to a file next to the words file, which later processes
+    memory-map instead of parsing the words file again.
+    :param words_path: Path to the words file
+    :return: A minimized WordTrie of all the words in the file
+    """
+    key = os.path.abspath(words_path)
+    trie = _loaded_dictionaries.get(key)
+    if trie is None:
+        trie = load_compiled_dictionary(words_path)
+        if trie is None:
+            trie = build_dictionary(words_path)
+        _loaded_dictionaries[key] = trie
+    return trie
+
+
+def get_compiled_path(words_path: str) -> str:
+    """
+    Function returns the path of the compiled file of a words file.
+    :param words_path: Path to the words file
+    :return: Path to the compiled file
+    """
+    return os.path.splitext(words_path)[0] + COMPILED_EXTENSION
+
+
+def get_source_info(words_path: str) -> Tuple[int, int]:
+    """
+    Function returns the size and modification time of the words file.
+    :param words_path: Path to the words file
+    :return: A tuple of (size in bytes, modification time in nanoseconds)
+    """
+    stat = os.stat(words_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def get_source_hash(words_path: str) -> bytes:
+    """
+    Function returns the sha256 digest of the words file.
+    :param words_path: Path to the words file
+    :return: The digest bytes
+    """
+    with open(words_path, "rb") as file:
+        return hashlib.sha256(file.read()).digest()
+
+
+def build_dictionary(words_path: str) -> WordTrie:
+    """
+    Function reads the words file, builds its minimized trie and tries to
+    save it compiled for the next loads.
+    :param words_path: Path to the words file
+    :return: A minimized WordTrie of all the words in the file
+    """
+    with open(words_path, "r") as file:
+        trie = WordTrie(file.read().split())
+    trie.minimize()
+    try:
+        write_compiled_dictionary(trie, words_path)
+    except OSError:
+        # The compiled file is only a cache, the game works without it
+        pass
+    return trie
+
+
+def write_compiled_dictionary(trie: WordTrie, words_path: str) -> None:
+    """
+    Function writes the trie to the compiled file of the words file. The
+    nodes are numbered and saved as packed arrays: the index of the first
+    edge of every node, the target node of every edge, whether every node
+    ends a word and the letter of every edge.
+    :param trie: The trie built from the words file
+    :param words_path: Path to the words file
+    """
+    nodes = number_nodes(trie.get_root())
+    node_ids = {id(node): i for i, node in enumerate(nodes)}
+    first_edges: List[int] = []
+    targets: List[int] = []
+    letters: List[str] = []
+    for node in nodes:
+        first_edges.append(len(targets))
+        for letter in sorted(node.children):
+            letters.append(letter)
+            targets.append(node_ids[id(node.children[letter])])
+    first_edges.append(len(targets))
+
+    size, mtime = get_source_info(words_path)
+    header = struct.pack(HEADER_FORMAT, COMPILED_MAGIC, COMPILED_VERSION,
+                         size, mtime, get_source_hash(words_path),
+                         len(nodes), len(targets), len(trie),
+                         trie.get_max_length())
+
+    atomic_write(get_compiled_path(words_path),
+                 [header,
+                  struct.pack(f"={len(first_edges)}I", *first_edges),
+                  struct.pack(f"={len(targets)}I", *targets),
+                  bytes(node.is_word for node in nodes),
+                  "".join(letters).encode("ascii")])
+
+
+def number_nodes(root: TrieNode) -> List[TrieNode]:
+    """
+    Function lists every node of the trie once, even if it is shared by a
+    few prefixes, in breadth first order so the root is first.
+    :param root: The root node of the trie
+    :return: A list of all the nodes
+    """
+    nodes = [root]
+    seen = {id(root)}
+    for node in nodes:
+        for letter in sorted(node.children):
+            child = node.children[letter]
+            if id(child) not in seen:
+                seen.add(id(child))
+                nodes.append(child)
+    return nodes
+
+
+def load_compiled_dictionary(words_path: str) -> Optional[WordTrie]:
+    """
+    Function memory-maps the compiled file of the words file and rebuilds
+    the trie from it, if the compiled file matches the words file.
+    :param words_path: Path to the words file
+    :return: The WordTrie, None if there is no up to date compiled file.
+    """
+    try:
+        with open(get_compiled_path(words_path), "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if not is_compiled_up_to_date(data, words_path):
+                    return None
+                return read_compiled_dictionary(data)
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def is_compiled_up_to_date(data: mmap.mmap, words_path: str) -> bool:
+    """
+    Function checks that the compiled data was built from the current words
+    file. The size and modification time are checked first, and the file
+    content hash is only compared if they changed.
+    :param data: The compiled file data
+    :param words_path: Path to the words file
+    :return: True if the compiled data is up to date, False otherwise.
+    """
+    if len(data) < HEADER_SIZE:
+        return False
+    magic, version, size, mtime, source_hash = \
+        struct.unpack_from(HEADER_FORMAT, data)[:5]
+    if magic != COMPILED_MAGIC or version != COMPILED_VERSION:
+        return False
+    if (size, mtime) == get_source_info(words_path):
+        return True
+    return source_hash == get_source_hash(words_path)
+
+
+def read_compiled_dictionary(data: mmap.mmap) -> WordTrie:
+    """
+    Function rebuilds the trie nodes from the compiled data.
+    :param data: The compiled file data
+    :return: The WordTrie of the compiled data
+    """
+    nodes_count, edges_count, words_count, max_length = \
+        struct.unpack_from(HEADER_FORMAT, data)[5:]
+    expected_size = HEADER_SIZE + (nodes_count + 1 + edges_count) * \
+        UINT_SIZE + nodes_count + edges_count
+    if len(data) != expected_size:
+        raise ValueError("The compiled dictionary file is corrupted")
+    offset = HEADER_SIZE
+    view = memoryview(data)
+    first_edges = view[offset:offset + (nodes_count + 1) * UINT_SIZE].cast("I")
+    offset += (nodes_count + 1) * UINT_SIZE
+    targets = view[offset:offset + edges_count * UINT_SIZE].cast("I")
+    offset += edges_count * UINT_SIZE
+    is_word = view[offset:offset + nodes_count]
+    offset += nodes_count
+    letters = bytes(view[offset:offset + edges_count]).decode("ascii")
+
+    try:
+        nodes = [TrieNode() for _ in range(nodes_count)]
+        for i, node in enumerate(nodes):
+            node.is_word = bool(is_word[i])
+            children = node.children
+            for edge in range(first_edges[i], first_edges[i + 1]):
+                children[letters[edge]] = nodes[targets[edge]]
+    finally:
+        # The views must be released before the memory map is closed
+        first_edges.release()
+        targets.release()
+        is_word.release()
+        view.release()
+    return WordTrie.from_root(nodes[0], words_count, max_length)
+
+
+def get_letters_signature(letters: str) -> int:
+    """
+    Function returns the signature of the letters, an int with a bit on for
+    every letter that appears in them.
+    :param letters: A word or the letters of a tile
+    :return: The letters signature
+    """
+    if "Q" in letters:
+        letters = letters.replace("QU", "q")
+    signature = 0
+    for letter in set(letters):
+        signature |= SIGNATURE_BITS.get(letter, OTHER_BIT)
+    return signature
+
+
+def get_tiles_signature(tiles: Iterable[str]) -> int:
+    """
+    Function returns the signature of all the letters of the given tiles.
+    :param tiles: The tiles of a board
+    :return: The letters signature of the tiles
+    """
+    signature = 0
+    for tile in tiles:
+        signature |= get_letters_signature(tile)
+    # A 'Q' tile next to a tile that starts with 'U' builds 'QU' as well
+    if signature & LONE_Q_BIT and signature & LETTER_BITS["U"]:
+        signature |= QU_BIT
+    return signature
+
+
+class LetterIndex:
+    """An index of words by their letters signature, used to find the words
+    that all their letters are on a board without checking every word."""
+    def __init__(self, words: Iterable[str]):
+        """
+        Initialize the index with the given words
+        :param words: An iterable of words
+        """
+        words_by_signature: Dict[int, List[str]] = dict()
+        for word in words:
+            signature = get_letters_signature(word)
+            words_by_signature.setdefault(signature, []).append(word)
+
+        # The words of signature self.__signatures[i] are the words between
+        # self.__starts[i] and self.__starts[i + 1]
+        self.__words: List[str] = []
+        self.__signatures = array("I")
+        self.__starts = array("I")
+        self.__groups: Dict[int, int] = dict()
+        for signature, signature_words in words_by_signature.items():
+            self.__groups[signature] = len(self.__signatures)
+            self.__signatures.append(signature)
+            self.__starts.append(len(self.__words))
+            self.__words.extend(signature_words)
+        self.__starts.append(len(self.__words))
+
+    def __len__(self) -> int:
+        """Returns the number of words in the index"""
+        return len(self.__words)
+
+    def __iter__(self):
+        """Yields all the words in the index"""
+        return iter(self.__words)
+
+    def get_words_with_letters(self, signature: int) -> Set[str]:
+        """
+        Function returns all the words that all their letters are in the
+        given signature. If the signature has few letters, all its subsets
+        are looked up, otherwise every signature in the index is checked.
+        :param signature: A letters signature, of a board for example
+        :return: A set of the matching words
+        """
+        words = self.__words
+        starts = self.__starts
+        result = set()
+        if 1 << bin(signature).count("1") <= len(self.__signatures):
+            subset = signature
+            while subset:
+                group = self.__groups.get(subset)
+                if group is not None:
+                    result.update(words[starts[group]:starts[group + 1]])
+                subset = (subset - 1) & signature
+        else:
+            missing = ~signature
+            for group, word_signature in enumerate(self.__signatures):
+                if not word_signature & missing:
+                    result.update(words[starts[group]:starts[group + 1]])
+        return result
+
+
+def get_count_letters(letters: str) -> str:
+    """
+    Function returns the letters as they are counted by a LetterCountIndex,
+    with every 'QU' as a single 'q'.
+    :param letters: A word or the letters of a tile
+    :return: The letters to count
+    """
+    if "Q" in letters:
+        return letters.replace("QU", "q")
+    return letters
+
+
+def get_tiles_counts(tiles: Iterable[str]) -> Dict[str, int]:
+    """
+    Function returns how many times every letter can be used in a word of
+    a board with the given tiles. A 'QU' tile counts as a 'q', and a 'Q'
+    tile counts as a 'q' as well if there is a tile that starts with 'U',
+    so the counts are never too small.
+    :param tiles: The tiles of a board
+    :return: A dict of the count of every letter
+    """
+    counts: Dict[str, int] = dict()
+    starts_with_u = False
+    for tile in tiles:
+        for letter in get_count_letters(tile):
+            counts[letter] = counts.get(letter, 0) + 1
+        starts_with_u = starts_with_u or tile.startswith("U")
+    if starts_with_u and "Q" in counts:
+        counts["q"] = counts.get("q", 0) + counts["Q"]
+    return counts
+
+
+def get_words_mask(indexes: List[int], size: int) -> int:
+    """
+    Function returns a bitset of word indexes.
+    :param indexes: The indexes of the words in the set
+    :param size: The number of words the indexes are of
+    :return: An int with the bit of every index on
+    """
+    bits = bytearray((size + 7) // 8)
+    for index in indexes:
+        bits[index >> 3] |= 1 << (index & 7)
+    return int.from_bytes(bits, "little")
+
+
+class LetterCountIndex:
+    """An index of words by their length and by how many times every letter
+    appears in them, used to find the words that a board has enough tiles
+    for without checking every word. The words of every length are a
+    bucket, and the letter counts of a bucket are kept by letter: for every
+    letter and count, a bitset of the words that have more of the letter
+    than that. Finding the words of a board is then one bitset OR for every
+    letter of every bucket.
+
+    The solvers don't search the words of a board in a trie of their own:
+    a path never uses a cell twice, so the search already never goes past
+    the tiles the board has, and building a trie for every board costs far
+    more than the search it saves. They search the trie of all the words
+    of the index instead, which is shared like the one of load_dictionary.
+    Finding the words of a board is for callers that want them as a set,
+    where it is much faster than checking every word of a words list."""
+    def __init__(self, words: Iterable[str],
+                 trie: Optional[WordTrie] = None):
+        """
+        Initialize the index with the given words
+        :param words: An iterable of words
+        :param trie: A trie of the same words, built from the words when it
+        is first needed if None
+        """
+        self.__trie = trie
+        words_by_length: Dict[int, List[str]] = dict()
+        for word in words:
+            words_by_length.setdefault(len(word), []).append(word)
+        self.__size = 0
+        # (words, {letter: [the words with more than count of the letter
+        # for every count]}) of every length
+        self.__buckets: Dict[int, Tuple[List[str], Dict[str, List[int]]]] = \
+            dict()
+        for length in sorted(words_by_length):
+            bucket_words = words_by_length[length]
+            bucket_letters = [get_count_letters(word) for word in bucket_words]
+            masks: Dict[str, List[int]] = dict()
+            # Going over a column of the counts at a time, only the words
+            # with more than count of a letter are checked for count + 1
+            for letter in set("".join(bucket_letters)):
+                letter_masks = masks[letter] = []
+                indexes = [index for index, letters in
+                           enumerate(bucket_letters) if letter in letters]
+                count = 1
+                while indexes:
+                    letter_masks.append(get_words_mask(indexes,
+                                                       len(bucket_words)))
+                    count += 1
+                    indexes = [index for index in indexes if
+                               bucket_letters[index].count(letter) >= count]
+            self.__buckets[length] = (bucket_words, masks)
+            self.__size += len(bucket_words)
+
+    def __len__(self) -> int:
+        """Returns the number of words in the index"""
+        return self.__size
+
+    def get_trie(self) -> WordTrie:
+        """Returns the trie of all the words in the index, building it the
+        first time"""
+        if self.__trie is None:
+            trie = WordTrie(self)
+            trie.minimize()
+            self.__trie = trie
+        return self.__trie
+
+    def __iter__(self):
+        """Yields all the words in the index"""
+        for bucket_words, _ in self.__buckets.values():
+            yield from bucket_words
+
+    def get_words_for_tiles(self, tiles: Iterable[str],
+                            lengths: Optional[Iterable[int]] = None) \
+            -> Set[str]:
+        """
+        Function returns all the words that the tiles have enough of every
+        letter for. The result may have words that the tiles can't build,
+        but never misses one.
+        :param tiles: The tiles of a board
+        :param lengths: The word lengths to look at, all the lengths the
+        tiles have enough letters for if None
+        :return: A set of the matching words
+        """
+        tiles = list(tiles)
+        counts = get_tiles_counts(tiles)
+        if lengths is None:
+            max_length = sum(len(tile) for tile in tiles)
+            lengths = [length for length in self.__buckets
+                       if length <= max_length]
+        result = set()
+        for length in lengths:
+            bucket = self.__buckets.get(length)
+            if bucket is None:
+                continue
+            bucket_words, masks = bucket
+            excluded = 0
+            for letter, letter_masks in masks.items():
+                count = counts.get(letter, 0)
+                if count < len(letter_masks):
+                    excluded |= letter_masks[count]
+            # The bits of the words that are left, lowest first
+            digits = bin(~excluded & ((1 << len(bucket_words)) - 1))[:1:-1]
+            index = digits.find("1")
+            while index != -1:
+                result.add(bucket_words[index])
+                index = digits.find("1", index + 1)
+        return result
+
+
+def load_letter_index(words_path: str = WORDS_PATH) -> LetterIndex:
+    """
+    Function returns the letters index of the given words file, built once
+    per process and shared by everyone who loads it.
+    :param words_path: Path to the words file
+    :return: The LetterIndex of all the words in the file
+    """
+    key = os.path.abspath(words_path)
+    index = _loaded_letter_indexes.get(key)
+    if index is None:
+        with open(words_path, "r") as file:
+            index = LetterIndex(file.read().split())
+        _loaded_letter_indexes[key] = index
+    return index
+
+
+def load_count_index(words_path: str = WORDS_PATH) -> LetterCountIndex:
+    """
+    Function returns the letter count index of the given words file, built
+    once per process and shared by everyone who loads it.
+    :param words_path: Path to the words file
+    :return: The LetterCountIndex of all the words in the file
+    """
+    key = os.path.abspath(words_path)
+    index = _loaded_count_indexes.get(key)
+    if index is None:
+        with open(words_path, "r") as file:
+            index = LetterCountIndex(file.read().split(),
+                                     load_dictionary(words_path))
+        _loaded_count_indexes[key] = index
+    return index
@@ -0,0 +1,24 @@
+import os
+from typing import Iterable
+
+
+def atomic_write(path: str, chunks: Iterable[bytes]) -> None:
+    """
+    Function writes a file through a temporary file that replaces it when
+    it is complete, so no one reads a half written file. The temporary file
+    is removed if the write fails.
+    :param path: Path to the file
+    :param chunks: The bytes to write, in order
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as file:
+            for chunk in chunks:
+                file.write(chunk)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
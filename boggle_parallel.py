@@ -0,0 +1,185 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
+
+import ex11_utils
+from boggle_compact import CompactBoard, CellsPath
+from boggle_dictionary import load_dictionary, WORDS_PATH
+
+Board = List[List[str]]
+Path = List[Tuple[int, int]]
+
+# The words trie of a worker process, loaded once when the worker starts
+_worker_trie = None
+# The last board a worker got and its compact board, since all the start
+# cells of a board are sent one after the other
+_worker_board: Optional[Tuple[Tuple[Tuple[str, ...], ...], CompactBoard]] = \
+    None
+
+
+def init_worker(words_path: str) -> None:
+    """
+    Function loads the dictionary of a worker process.
+    :param words_path: Path to the words file
+    """
+    global _worker_trie
+    _worker_trie = load_dictionary(words_path)
+
+
+def get_compact_board(board: Board) -> CompactBoard:
+    """
+    Function returns the compact board of the board, reusing it if the
+    worker got the same board last time.
+    :param board: A game board
+    :return: The compact board
+    """
+    global _worker_board
+    key = tuple(tuple(row) for row in board)
+    if _worker_board is None or _worker_board[0] != key:
+        _worker_board = (key, CompactBoard(board))
+    return _worker_board[1]
+
+
+def solve_cell_words(board: Board, cell: int) \
+        -> Tuple[Dict[str, CellsPath], Dict[str, Tuple[int, int]]]:
+    """
+    Function finds the words that start at a cell, in a worker process.
+    :param board: A game board
+    :param cell: The index of the start cell in the flattened board
+    :return: The result of ex11_utils.find_cell_words
+    """
+    return ex11_utils.find_cell_words(cell, _worker_trie.get_root(),
+                                      get_compact_board(board))
+
+
+def solve_cell_length_n(board: Board, cell: int, n: int, length_type: str) \
+        -> List[CellsPath]:
+    """
+    Function finds the length n paths that start at a cell, in a worker
+    process.
+    :param board: A game board
+    :param cell: The index of the start cell in the flattened board
+    :param n: A length int
+    :param length_type: If n represents the length of path or length of word
+    :return: The result of ex11_utils.find_cell_length_n
+    """
+    return ex11_utils.find_cell_length_n(cell, _worker_trie.get_root(),
+                                         get_compact_board(board), n,
+                                         length_type)
+
+
+def solve_whole_board(board: Board) -> Dict[str, Path]:
+    """
+    Function solves a whole board in a worker process.
+    :param board: A game board
+    :return: The result of ex11_utils.solve_board
+    """
+    return ex11_utils.solve_board(board, _worker_trie)
+
+
+class ParallelSolver:
+    """A board solver that splits the start cells of a board between a pool
+    of processes. Every process loads the dictionary once and only reads
+    it, and the results are merged in the order of the cells, so they are
+    the same as the results of the serial functions in ex11_utils."""
+    def __init__(self, words_path: str = WORDS_PATH,
+                 workers: Optional[int] = None):
+        """
+        Initialize the solver and its processes pool
+        :param words_path: Path to the words file
+        :param workers: The number of processes, the number of CPUs if None
+        """
+        # Loading before the pool starts lets forked workers share the trie
+        load_dictionary(words_path)
+        self.__executor = ProcessPoolExecutor(max_workers=workers,
+                                              initializer=init_worker,
+                                              initargs=(words_path,))
+
+    def __enter__(self) -> "ParallelSolver":
+        """Returns the solver for a with statement"""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Closes the solver at the end of a with statement"""
+        self.close()
+
+    def close(self) -> None:
+        """Function stops the processes of the solver"""
+        self.__executor.shutdown()
+
+    def __find_length_n(self, n: int, board: Board, length_type: str) \
+            -> List[Path]:
+        """
+        Function finds the length n paths of the board, from all the start
+        cells in parallel.
+        :param n: A length int
+        :param board: A game board
+        :param length_type: If n represents the length of path or length of
+        word
+        :return: A list of paths of all the valid words of length n
+        """
+        if len(board) == 0 or len(board[0]) == 0:
+            return []
+        cols = len(board[0])
+        cells = range(len(board) * cols)
+        result = []
+        for cell_paths in self.__executor.map(
+                solve_cell_length_n, [board] * len(cells), cells,
+                [n] * len(cells), [length_type] * len(cells)):
+            result.extend(ex11_utils.cells_to_path(cells_path, cols)
+                          for cells_path in cell_paths)
+        return result
+
+    def find_length_n_paths(self, n: int, board: Board) -> List[Path]:
+        """
+        Function returns the paths of path length n that build words, like
+        ex11_utils.find_length_n_paths.
+        :param n: A length int
+        :param board: A game board
+        :return: A list of paths of all the valid words of path length n
+        """
+        return self.__find_length_n(n, board, "path")
+
+    def find_length_n_words(self, n: int, board: Board) -> List[Path]:
+        """
+        Function returns the paths of words of length n, like
+        ex11_utils.find_length_n_words.
+        :param n: A length int
+        :param board: A game board
+        :return: A list of paths of all the valid words of length n
+        """
+        return self.__find_length_n(n, board, "word")
+
+    def solve_board(self, board: Board) -> Dict[str, Path]:
+        """
+        Function finds all the words on the board and their longest paths,
+        like ex11_utils.solve_board.
+        :param board: A game board
+        :return: A dict of every word on the board and its longest path
+        """
+        if len(board) == 0 or len(board[0]) == 0:
+            return dict()
+        cells = range(len(board) * len(board[0]))
+        cells_words = self.__executor.map(solve_cell_words,
+                                          [board] * len(cells), cells)
+        return ex11_utils.merge_cells_words(cells_words, len(board[0]))
+
+    def max_score_paths(self, board: Board) -> List[Path]:
+        """
+        Function returns the paths that yield the highest score for the
+        board, like ex11_utils.max_score_paths.
+        :param board: A game board
+        :return: A list of paths that yield the highest score
+        """
+        return list(self.solve_board(board).values())
+
+    def solve_boards(self, boards: Iterable[Board], chunk_size: int = 16) \
+            -> Iterator[Dict[str, Path]]:
+        """
+        Function solves many boards, each one whole in one of the processes,
+        and yields the results in the order of the boards.
+        :param boards: An iterable of game boards
+        :param chunk_size: The number of boards sent to a process at once
+        :return: An iterator of the solve_board result of every board
+        """
+        return self.__executor.map(solve_whole_board, boards,
+                                   chunksize=chunk_size)
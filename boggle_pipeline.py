@@ -0,0 +1,108 @@
+import queue
+import threading
+from typing import List, Optional
+
+from BoggleBoard import BoggleBoard
+from boggle_board_randomizer import BOARD_SIZE
+from boggle_pool import BoardPool, Range
+
+BOARDS_AHEAD = 1
+# How often the worker checks if it was stopped while the queue is full
+STOP_CHECK_SECONDS = 0.5
+
+
+class BoardPipeline:
+    """Prepares the next games' boards on a background thread, so a new
+    game can start without waiting for a board to be randomized and
+    solved."""
+    def __init__(self, boards_ahead: int = BOARDS_AHEAD,
+                 rows: int = BOARD_SIZE, cols: int = BOARD_SIZE,
+                 dice: Optional[List[List[str]]] = None,
+                 pool: Optional[BoardPool] = None,
+                 score_range: Range = None, words_range: Range = None):
+        """
+        Initialize the pipeline and start preparing boards
+        :param boards_ahead: The number of boards to keep ready
+        :param rows: The number of rows of the boards
+        :param cols: The number of columns of the boards
+        :param dice: The dice to roll the boards from, the dice set of the
+        board size if None
+        :param pool: Solved boards to pick the boards from, if it has boards
+        of the size within the ranges
+        :param score_range: The range of max scores to pick from the pool
+        :param words_range: The range of word counts to pick from the pool
+        """
+        self.__rows = rows
+        self.__cols = cols
+        self.__dice = dice
+        self.__pool = pool
+        self.__score_range = score_range
+        self.__words_range = words_range
+        self.__ready_boards = queue.Queue(maxsize=boards_ahead)
+        self.__error: Optional[BaseException] = None
+        self.__stopped = threading.Event()
+        self.__thread = threading.Thread(target=self.__prepare_boards,
+                                         daemon=True)
+        self.__thread.start()
+
+    def __prepare_boards(self) -> None:
+        """
+        Function keeps the queue of ready boards full until the pipeline is
+        stopped. Runs on the background thread.
+        """
+        while not self.__stopped.is_set():
+            try:
+                board = BoggleBoard(self.__rows, self.__cols, self.__dice,
+                                    pool=self.__pool,
+                                    score_range=self.__score_range,
+                                    words_range=self.__words_range)
+            except Exception as error:
+                # Raised again by get_board in the thread that asks for it
+                self.__error = error
+                return
+            while not self.__stopped.is_set():
+                try:
+                    self.__ready_boards.put(board, timeout=STOP_CHECK_SECONDS)
+                    break
+                except queue.Full:
+                    pass
+
+    def get_ready_board(self) -> Optional[BoggleBoard]:
+        """
+        Function returns a board if one is ready, without waiting.
+        :return: A ready BoggleBoard, None if no board is ready yet.
+        """
+        try:
+            return self.__ready_boards.get_nowait()
+        except queue.Empty:
+            self.__raise_error()
+            return None
+
+    def get_board(self, timeout: Optional[float] = None) -> BoggleBoard:
+        """
+        Function returns the next board, waiting for it if it isn't ready.
+        Shouldn't be called from the GUI main loop.
+        :param timeout: The maximal seconds to wait, forever if None
+        :return: A ready BoggleBoard
+        """
+        while True:
+            try:
+                return self.__ready_boards.get(timeout=STOP_CHECK_SECONDS
+                                               if timeout is None
+                                               else timeout)
+            except queue.Empty:
+                self.__raise_error()
+                if timeout is not None:
+                    raise
+
+    def __raise_error(self) -> None:
+        """
+        Function raises the error that stopped the background thread, if
+        there was one.
+        """
+        if self.__error is not None:
+            raise self.__error
+
+    def stop(self) -> None:
+        """Function stops preparing boards"""
+        self.__stopped.set()
@@ -0,0 +1,327 @@
+import json
+import os
+import random
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Iterator, Optional, Tuple
+
+from boggle_files import atomic_write
+
+Board = List[List[str]]
+# An inclusive (lowest, highest) range, where None is unbounded
+Range = Optional[Tuple[Optional[int], Optional[int]]]
+
+POOL_PATH = "boggle_pool.jsonl"
+INDEX_EXTENSION = ".idx"
+INDEX_MAGIC = b"BOGPOOL" + (b"L" if sys.byteorder == "little" else b"B")
+INDEX_VERSION = 1
+# magic, version, pool file size, boards count, rows, cols
+INDEX_HEADER_FORMAT = "=8sIQIII"
+INDEX_HEADER_SIZE = struct.calcsize(INDEX_HEADER_FORMAT)
+
+# The pools loaded in this process, by the absolute pool file path
+_loaded_pools: Dict[str, "BoardPool"] = dict()
+
+
+class BoardPool:
+    """A file of solved boards, one JSON line per board with its max score,
+    word count and words, and an index of the boards by their max score and
+    word count. Picking a board within a range of scores or word counts
+    only looks up the index and reads the line of the picked board."""
+    def __init__(self, pool_path: str = POOL_PATH):
+        """
+        Initialize the pool, loading its index and reading the boards the
+        pool file has after the indexed ones, or building the index again
+        from the pool file if the index doesn't match it
+        :param pool_path: Path to the pool file
+        """
+        self.__pool_path = pool_path
+        self.__size: Optional[Tuple[int, int]] = None
+        # The max score, word count and line offset of every board, in the
+        # order of the pool file
+        self.__scores = array("I")
+        self.__word_counts = array("I")
+        self.__offsets = array("Q")
+        # The end of the last board line in the pool file
+        self.__pool_end = 0
+        # Without an index that matches the pool file, every board is read
+        self.__load_index()
+        self.__read_boards()
+        self.__sort_index()
+
+    def __load_index(self) -> bool:
+        """
+        Function loads the index file of the pool. The index may cover only
+        the start of the pool file, like after an interrupted generation.
+        :return: True if the index was loaded, False if it is missing or
+        doesn't match the pool file.
+        """
+        try:
+            with open(get_index_path(self.__pool_path), "rb") as file:
+                data = file.read()
+            magic, version, indexed_size, count, rows, cols = \
+                struct.unpack_from(INDEX_HEADER_FORMAT, data)
+            if magic != INDEX_MAGIC or version != INDEX_VERSION or \
+                    not self.__is_line_end(indexed_size):
+                return False
+        except (OSError, struct.error):
+            return False
+        ints_size = count * self.__scores.itemsize
+        offsets_size = count * self.__offsets.itemsize
+        if len(data) != INDEX_HEADER_SIZE + 2 * ints_size + offsets_size:
+            return False
+        start = INDEX_HEADER_SIZE
+        self.__scores.frombytes(data[start:start + ints_size])
+        start += ints_size
+        self.__word_counts.frombytes(data[start:start + ints_size])
+        start += ints_size
+        self.__offsets.frombytes(data[start:])
+        self.__pool_end = indexed_size
+        if count:
+            self.__size = (rows, cols)
+        return True
+
+    def __is_line_end(self, offset: int) -> bool:
+        """
+        Function checks if a board line of the pool file ends at an offset.
+        :param offset: An offset in the pool file
+        :return: True if the offset is the start of the file or right after
+        a new line, False otherwise.
+        """
+        if offset == 0:
+            return True
+        with open(self.__pool_path, "rb") as file:
+            file.seek(offset - 1)
+            return file.read(1) == b"\n"
+
+    def __read_boards(self) -> None:
+        """
+        Function adds to the index the boards of the pool file after the
+        indexed ones. A last line that was not written to the end is left
+        out.
+        """
+        try:
+            file = open(self.__pool_path, "rb")
+        except FileNotFoundError:
+            return
+        with file:
+            offset = self.__pool_end
+            file.seek(offset)
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                entry = json.loads(line)
+                self.__add(entry["board"], entry["max_score"],
+                           entry["word_count"], offset)
+                offset += len(line)
+        self.__pool_end = offset
+
+    def __add(self, board: Board, max_score: int, word_count: int,
+              offset: int) -> None:
+        """
+        Function adds a board to the index.
+        :param board: The board
+        :param max_score: The max score of the board
+        :param word_count: The number of words on the board
+        :param offset: The offset of the board line in the pool file
+        """
+        size = (len(board), len(board[0]))
+        if self.__size is None:
+            self.__size = size
+        elif size != self.__size:
+            raise ValueError(f"A {size[0]}x{size[1]} board in a pool of "
+                             f"{self.__size[0]}x{self.__size[1]} boards")
+        self.__scores.append(max_score)
+        self.__word_counts.append(word_count)
+        self.__offsets.append(offset)
+
+    def __sort_index(self) -> None:
+        """
+        Function sorts the boards by max score and by word count, so a
+        range of either is found by bisecting.
+        """
+        count = len(self.__scores)
+        self.__by_score = sorted(range(count), key=self.__scores.__getitem__)
+        self.__sorted_scores = array("I", (self.__scores[i]
+                                           for i in self.__by_score))
+        self.__by_word_count = sorted(range(count),
+                                      key=self.__word_counts.__getitem__)
+        self.__sorted_word_counts = array("I", (self.__word_counts[i]
+                                                for i in self.__by_word_count))
+
+    def save_index(self) -> None:
+        """Function writes the index file of the pool"""
+        rows, cols = self.__size if self.__size is not None else (0, 0)
+        header = struct.pack(INDEX_HEADER_FORMAT, INDEX_MAGIC, INDEX_VERSION,
+                             self.__pool_end, len(self.__scores), rows, cols)
+        atomic_write(get_index_path(self.__pool_path),
+                     [header, self.__scores.tobytes(),
+                      self.__word_counts.tobytes(),
+                      self.__offsets.tobytes()])
+
+    def __len__(self) -> int:
+        """Returns the number of boards in the pool"""
+        return len(self.__scores)
+
+    def get_size(self) -> Optional[Tuple[int, int]]:
+        """Returns the (rows, cols) of the boards, None if the pool is
+        empty"""
+        return self.__size
+
+    def get_pool_end(self) -> int:
+        """Returns the end of the last board line in the pool file"""
+        return self.__pool_end
+
+    def add_board(self, board: Board, max_score: int, word_count: int,
+                  offset: int, line_size: int) -> None:
+        """
+        Function adds a board that was written to the end of the pool file.
+        The sorted index is only updated when the pool is loaded again.
+        :param board: The board
+        :param max_score: The max score of the board
+        :param word_count: The number of words on the board
+        :param offset: The offset of the board line in the pool file
+        :param line_size: The size of the board line in bytes
+        """
+        self.__add(board, max_score, word_count, offset)
+        self.__pool_end = offset + line_size
+
+    def count_boards(self, score_range: Range = None,
+                     words_range: Range = None) -> int:
+        """
+        Function counts the boards within the given ranges.
+        :param score_range: The range of max scores, any score if None
+        :param words_range: The range of word counts, any count if None
+        :return: The number of matching boards
+        """
+        return sum(1 for _ in self.__iter_matches(score_range, words_range))
+
+    def pick_board(self, score_range: Range = None,
+                   words_range: Range = None,
+                   rng: random.Random = random) -> Optional[Dict]:
+        """
+        Function picks a random board within the given ranges. With one
+        range the board is found in O(log n). With both, the boards of the
+        narrower range are checked from a random one until one is in the
+        other range as well.
+        :param score_range: The range of max scores, any score if None
+        :param words_range: The range of word counts, any count if None
+        :param rng: The random generator to pick with
+        :return: A dict of the board, max_score, word_count and words of the
+        board, None if no board is within the ranges.
+        """
+        (first, last), order, check = self.__get_narrower(score_range,
+                                                          words_range)
+        if first == last:
+            return None
+        start = rng.randrange(first, last)
+        for position in range(last - first):
+            board_id = order[first + (start - first + position) %
+                             (last - first)]
+            if check is None or is_in_range(check[0][board_id], check[1]):
+                return self.read_board(board_id)
+        return None
+
+    def read_board(self, board_id: int) -> Dict:
+        """
+        Function reads a board from the pool file.
+        :param board_id: The index of the board in the pool file
+        :return: A dict of the board, max_score, word_count and words of the
+        board
+        """
+        with open(self.__pool_path, "rb") as file:
+            file.seek(self.__offsets[board_id])
+            return json.loads(file.readline())
+
+    def __get_narrower(self, score_range: Range, words_range: Range) \
+            -> Tuple[Tuple[int, int], List[int],
+                     Optional[Tuple[array, Range]]]:
+        """
+        Function finds the boards within each range, and returns the
+        narrower one and how to check the other range.
+        :param score_range: The range of max scores, any score if None
+        :param words_range: The range of word counts, any count if None
+        :return: A tuple of the (first, last) positions of the narrower
+        range in its order, the order, and (values, range) of the other
+        range or None if it doesn't need checking.
+        """
+        score_span = get_span(self.__sorted_scores, score_range)
+        words_span = get_span(self.__sorted_word_counts, words_range)
+        if score_span[1] - score_span[0] <= words_span[1] - words_span[0]:
+            check = None if words_range is None \
+                else (self.__word_counts, words_range)
+            return score_span, self.__by_score, check
+        check = None if score_range is None else (self.__scores, score_range)
+        return words_span, self.__by_word_count, check
+
+    def __iter_matches(self, score_range: Range, words_range: Range) \
+            -> Iterator[int]:
+        """
+        Function yields the ids of the boards within the given ranges.
+        :param score_range: The range of max scores, any score if None
+        :param words_range: The range of word counts, any count if None
+        :return: An iterator of board ids
+        """
+        (first, last), order, check = self.__get_narrower(score_range,
+                                                          words_range)
+        for position in range(first, last):
+            board_id = order[position]
+            if check is None or is_in_range(check[0][board_id], check[1]):
+                yield board_id
+
+
+def get_index_path(pool_path: str) -> str:
+    """
+    Function returns the path of the index file of a pool file.
+    :param pool_path: Path to the pool file
+    :return: Path to the index file
+    """
+    return pool_path + INDEX_EXTENSION
+
+
+def get_span(sorted_values: array, value_range: Range) -> Tuple[int, int]:
+    """
+    Function finds the positions of the values within a range.
+    :param sorted_values: Sorted values
+    :param value_range: An inclusive range, everything if None
+    :return: The (first, last) positions, last not included
+    """
+    lowest, highest = value_range if value_range is not None else (None,
+                                                                   None)
+    first = 0 if lowest is None else bisect_left(sorted_values, lowest)
+    last = len(sorted_values) if highest is None \
+        else bisect_right(sorted_values, highest)
+    return first, max(first, last)
+
+
+def is_in_range(value: int, value_range: Range) -> bool:
+    """
+    Function checks if a value is within a range.
+    :param value: A value
+    :param value_range: An inclusive range, everything if None
+    :return: True if the value is within the range, False otherwise.
+    """
+    if value_range is None:
+        return True
+    lowest, highest = value_range
+    return (lowest is None or value >= lowest) and \
+        (highest is None or value <= highest)
+
+
+def load_board_pool(pool_path: str = POOL_PATH) -> Optional[BoardPool]:
+    """
+    Function returns the board pool of the given file, loaded once per
+    process and shared by everyone who loads it.
+    :param pool_path: Path to the pool file
+    :return: The BoardPool, None if the file doesn't exist or is empty
+    """
+    key = os.path.abspath(pool_path)
+    pool = _loaded_pools.get(key)
+    if pool is None:
+        if not os.path.exists(pool_path):
+            return None
+        pool = BoardPool(pool_path)
+        _loaded_pools[key] = pool
+    return pool if len(pool) else None
@@ -0,0 +1,112 @@
+import argparse
+import json
+import random
+import time
+from typing import List, Iterator, Optional
+
+import ex11_utils
+from boggle_analyze import solve_boards, print_throughput, PROGRESS_EVERY
+from boggle_board_randomizer import randomize_board, BOARD_SIZE
+from boggle_dictionary import WORDS_PATH
+from boggle_pool import BoardPool, POOL_PATH
+
+Board = List[List[str]]
+
+# The index is saved every this many boards while the pool is generated, so
+# an interrupted generation only parses the boards after it to resume
+INDEX_EVERY = 256
+
+
+def generate_pool_boards(first: int, count: int, size: int,
+                         seed: Optional[int]) -> Iterator[Board]:
+    """
+    Function yields the random boards of a pool, from the given board on.
+    With a seed every board depends only on the seed and its position, so a
+    generation that is resumed makes the same boards.
+    :param first: The position of the first board
+    :param count: The number of boards in the whole pool
+    :param size: The number of rows and columns of the boards
+    :param seed: The random seed, a random one if None
+    :return: An iterator of the boards
+    """
+    for position in range(first, count):
+        rng = random if seed is None else random.Random(f"{seed}:{position}")
+        yield randomize_board(rows=size, cols=size, rng=rng)
+
+
+def generate_pool(pool_path: str, count: int, size: int,
+                  seed: Optional[int], words_path: str,
+                  workers: Optional[int], progress_every: int) -> int:
+    """
+    Function solves random boards and adds them to the pool file until it
+    has count boards. A pool file that already has boards is continued, and
+    a board line that was not written to the end is overwritten.
+    :param pool_path: Path to the pool file
+    :param count: The number of boards the pool should have
+    :param size: The number of rows and columns of the boards
+    :param seed: The random seed, a random one if None
+    :param words_path: Path to the words file
+    :param workers: The number of processes, solve in this process if None
+    :param progress_every: Report the throughput every this many boards
+    :return: The number of boards added
+    """
+    pool = BoardPool(pool_path)
+    if pool.get_size() not in (None, (size, size)):
+        raise ValueError(f"The pool has boards of size {pool.get_size()}")
+    boards = generate_pool_boards(len(pool), count, size, seed)
+    start = time.perf_counter()
+    added = 0
+    with open(pool_path, "ab") as file:
+        file.truncate(pool.get_pool_end())
+        file.seek(pool.get_pool_end())
+        for board, board_words in solve_boards(boards, words_path, workers):
+            max_score = ex11_utils.get_score(board_words.values())
+            entry = {"board": board, "max_score": max_score,
+                     "word_count": len(board_words),
+                     "words": list(board_words)}
+            line = (json.dumps(entry, separators=(",", ":")) +
+                    "\n").encode("ascii")
+            pool.add_board(board, max_score, len(board_words), file.tell(),
+                           len(line))
+            file.write(line)
+            added += 1
+            if added % INDEX_EVERY == 0:
+                file.flush()
+                pool.save_index()
+            if progress_every and added % progress_every == 0:
+                print_throughput(added, time.perf_counter() - start)
+    pool.save_index()
+    print_throughput(added, time.perf_counter() - start)
+    return added
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    """
+    Function runs the command line tool.
+    :param args: The command line arguments, sys.argv if None
+    """
+    parser = argparse.ArgumentParser(
+        description="Solve random Boggle boards into a pool that games pick "
+                    "their boards from. Running it again continues the "
+                    "pool.")
+    parser.add_argument("count", type=int,
+                        help="the number of boards the pool should have")
+    parser.add_argument("--pool", default=POOL_PATH,
+                        help="path to the pool file")
+    parser.add_argument("--size", type=int, default=BOARD_SIZE,
+                        help="rows and columns of the boards")
+    parser.add_argument("--seed", type=int, help="seed of the boards")
+    parser.add_argument("--words", default=WORDS_PATH,
+                        help="path to the words file")
+    parser.add_argument("--workers", type=int,
+                        help="solve on this many processes")
+    parser.add_argument("--progress-every", type=int, default=PROGRESS_EVERY,
+                        help="report the throughput every this many boards, "
+                             "0 to only report at the end")
+    args = parser.parse_args(args)
+    generate_pool(args.pool, args.count, args.size, args.seed, args.words,
+                  args.workers, args.progress_every)
+
+
+if __name__ == "__main__":
+    main()
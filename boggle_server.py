@@ -0,0 +1,272 @@
+import argparse
+import asyncio
+import functools
+import itertools
+import json
+import time
+from typing import Dict, Optional, Tuple
+
+from BoggleBoard import BoggleBoard, GAME_TIME, WORDS_PATH
+from boggle_board_randomizer import BOARD_SIZE
+from boggle_dictionary import load_dictionary
+
+HOST = "127.0.0.1"
+PORT = 8765
+# Finished sessions are kept a little longer so players can read the result
+SESSION_GRACE_TIME = 60
+CLEANUP_INTERVAL = 10
+MAX_BOARD_SIZE = 8
+
+
+class GameSession:
+    """A game of one player on the server"""
+    def __init__(self, session_id: str, boggle_board: BoggleBoard):
+        """
+        Initialize the session, its game time starts now
+        :param session_id: The id of the session
+        :param boggle_board: The game board of the player
+        """
+        self.__session_id = session_id
+        self.__boggle_board = boggle_board
+        self.__start_time = time.monotonic()
+
+    def get_session_id(self) -> str:
+        """Returns the id of the session"""
+        return self.__session_id
+
+    def get_boggle_board(self) -> BoggleBoard:
+        """Returns the game board of the session"""
+        return self.__boggle_board
+
+    def get_time_left(self) -> float:
+        """Returns the seconds left in the game"""
+        return max(GAME_TIME - (time.monotonic() - self.__start_time), 0)
+
+    def is_expired(self) -> bool:
+        """Returns True if the game ended long enough ago to be removed"""
+        return time.monotonic() - self.__start_time > \
+            GAME_TIME + SESSION_GRACE_TIME
+
+    def is_over(self) -> bool:
+        """Returns True if the game is over, False otherwise"""
+        return self.get_time_left() == 0 or \
+            self.__boggle_board.is_max_score() or \
+            self.__boggle_board.is_found_all_words()
+
+    def get_state(self) -> Dict:
+        """Returns the state of the game to send to the player"""
+        return {"session": self.__session_id,
+                "score": self.__boggle_board.get_score(),
+                "time_left": round(self.get_time_left(), 3),
+                "over": self.is_over(),
+                "max_score": self.__boggle_board.is_max_score(),
+                "found_all_words": self.__boggle_board.is_found_all_words()}
+
+
+class RequestError(Exception):
+    """An error in a request of a player"""
+
+
+class BoggleServer:
+    """An asyncio server that hosts many Boggle games at once. Players send
+    JSON requests, one per line, and get a JSON response line for every
+    request. All the games share the dictionary, and games joined to
+    another game share its solved board."""
+    def __init__(self, host: str = HOST, port: int = PORT,
+                 words_path: str = WORDS_PATH):
+        """
+        Initialize the server
+        :param host: The address to listen on
+        :param port: The port to listen on, 0 for any free port
+        :param words_path: Path to the words file
+        """
+        self.__host = host
+        self.__port = port
+        self.__words_path = words_path
+        self.__sessions: Dict[str, GameSession] = dict()
+        self.__session_ids = itertools.count(1)
+        self.__server: Optional[asyncio.AbstractServer] = None
+        self.__cleanup_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> Tuple[str, int]:
+        """
+        Function loads the dictionary and starts listening.
+        :return: The (host, port) the server listens on
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, load_dictionary, self.__words_path)
+        self.__server = await asyncio.start_server(self.__handle_client,
+                                                   self.__host, self.__port)
+        self.__cleanup_task = asyncio.create_task(self.__cleanup_sessions())
+        return self.__server.sockets[0].getsockname()[:2]
+
+    async def stop(self) -> None:
+        """Function stops the server"""
+        if self.__cleanup_task is not None:
+            self.__cleanup_task.cancel()
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+
+    async def serve_forever(self) -> None:
+        """Function starts the server and serves until cancelled"""
+        host, port = await self.start()
+        print(f"Boggle server listening on {host}:{port}")
+        try:
+            await self.__server.serve_forever()
+        finally:
+            await self.stop()
+
+    def get_sessions_count(self) -> int:
+        """Returns the number of sessions on the server"""
+        return len(self.__sessions)
+
+    async def __cleanup_sessions(self) -> None:
+        """
+        Function removes the sessions that their time ran out a while ago.
+        """
+        while True:
+            await asyncio.sleep(CLEANUP_INTERVAL)
+            for session_id, session in list(self.__sessions.items()):
+                if session.is_expired():
+                    del self.__sessions[session_id]
+
+    async def __handle_client(self, reader: asyncio.StreamReader,
+                              writer: asyncio.StreamWriter) -> None:
+        """
+        Function answers the requests of a connected player until the
+        player disconnects.
+        :param reader: The stream of the player requests
+        :param writer: The stream of the responses
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = await self.handle_request(line)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, line: bytes) -> Dict:
+        """
+        Function handles one request line.
+        :param line: A JSON request
+        :return: The response to send back
+        """
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise RequestError("A request must be a JSON object")
+            request_id = request.get("id")
+            response = await self.__dispatch(request)
+            response["ok"] = True
+        except (RequestError, ValueError) as error:
+            response = {"ok": False, "error": str(error)}
+        if request_id is not None:
+            response["id"] = request_id
+        return response
+
+    async def __dispatch(self, request: Dict) -> Dict:
+        """
+        Function runs the operation of a request.
+        :param request: The request
+        :return: The response to send back
+        """
+        op = request.get("op")
+        if op == "new_game":
+            return await self.__new_game(request)
+        session = self.__get_session(request)
+        if op == "join_game":
+            return self.__add_session(BoggleBoard(
+                same_board_as=session.get_boggle_board()))
+        if op == "state":
+            state = session.get_state()
+            boggle_board = session.get_boggle_board()
+            state["words"] = boggle_board.get_submitted_words()
+            state["remaining"] = {
+                length: {"words": words, "points": points}
+                for length, (words, points)
+                in boggle_board.get_remaining_by_length().items()}
+            return state
+        if op == "end_game":
+            del self.__sessions[session.get_session_id()]
+            return session.get_state()
+        if session.is_over():
+            raise RequestError("The game is over")
+        if op == "add_coordinate":
+            row, col = request.get("row"), request.get("col")
+            if not isinstance(row, int) or not isinstance(col, int):
+                raise RequestError("row and col must be integers")
+            accepted = session.get_boggle_board().add_coordinate((row, col))
+            return {"accepted": accepted}
+        if op == "add_submitted_word":
+            accepted = session.get_boggle_board().add_submitted_word()
+            state = session.get_state()
+            state["accepted"] = accepted
+            return state
+        raise RequestError(f"Unknown op: {op!r}")
+
+    async def __new_game(self, request: Dict) -> Dict:
+        """
+        Function creates a session with a new board. The board is solved on
+        a thread, so other players aren't kept waiting.
+        :param request: The request, may have the board rows and cols
+        :return: The response with the new session
+        """
+        rows = request.get("rows", BOARD_SIZE)
+        cols = request.get("cols", BOARD_SIZE)
+        if not isinstance(rows, int) or not isinstance(cols, int) or \
+                not 1 <= rows <= MAX_BOARD_SIZE or \
+                not 1 <= cols <= MAX_BOARD_SIZE:
+            raise RequestError(f"rows and cols must be integers between 1 "
+                               f"and {MAX_BOARD_SIZE}")
+        loop = asyncio.get_running_loop()
+        boggle_board = await loop.run_in_executor(
+            None, functools.partial(BoggleBoard, rows, cols,
+                                    words_path=self.__words_path))
+        return self.__add_session(boggle_board)
+
+    def __add_session(self, boggle_board: BoggleBoard) -> Dict:
+        """
+        Function adds a session with the given game board.
+        :param boggle_board: The game board of the session
+        :return: The response with the new session
+        """
+        session = GameSession(str(next(self.__session_ids)), boggle_board)
+        self.__sessions[session.get_session_id()] = session
+        response = session.get_state()
+        response["board"] = boggle_board.get_board_copy()
+        return response
+
+    def __get_session(self, request: Dict) -> GameSession:
+        """
+        Function returns the session of the request.
+        :param request: The request
+        :return: The session
+        """
+        session_id = request.get("session")
+        session = self.__sessions.get(session_id) \
+            if isinstance(session_id, str) else None
+        if session is None:
+            raise RequestError("Unknown session")
+        return session
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a Boggle game server")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--words", default=WORDS_PATH,
+                        help="path to the words file")
+    args = parser.parse_args()
+    try:
+        asyncio.run(BoggleServer(args.host, args.port,
+                                 args.words).serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,112 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+Coordinate = Tuple[int, int]
+
+
+class SolverStats:
+    """Counters of the work a solver did, for finding out why a board was
+    slow. Pass one to a solver function of ex11_utils to fill it in; the
+    solvers only check for it once per step, so solving without it costs
+    nothing extra. A lookup is following one tile from a trie node, a prune
+    is a lookup that no word continues with, and a visited node is a lookup
+    that some word continues with."""
+    __slots__ = ("nodes_visited", "prunes", "lookups", "max_depth",
+                 "cell_times", "on_cell")
+
+    def __init__(self, on_cell: Optional[Callable[[Coordinate, float,
+                                                   "SolverStats"],
+                                                  None]] = None):
+        """
+        Initialize empty stats
+        :param on_cell: A function to call after every start cell is
+        searched, with the cell coordinate, the seconds it took and the stats
+        """
+        self.nodes_visited = 0
+        self.prunes = 0
+        self.lookups = 0
+        self.max_depth = 0
+        # The seconds the search from every start cell took
+        self.cell_times: Dict[Coordinate, float] = dict()
+        self.on_cell = on_cell
+
+    def add_node(self, depth: int, visited: int, children: Optional[Dict],
+                 tiles: List[str], neighbors: List[Tuple[int, int]]) -> None:
+        """
+        Function counts a node of the fast solvers and the lookups of the
+        neighbors it goes on to. The fast solvers look up the first letter
+        of every neighbor that isn't visited before going on to it.
+        :param depth: The length of the path of the node
+        :param visited: A bitmask of the cells of the path
+        :param children: The trie children of the node, None or empty if
+        the solver doesn't go on from the node
+        :param tiles: The letters of the flattened board
+        :param neighbors: The neighbors of the last cell of the path
+        """
+        self.nodes_visited += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+        if not children:
+            return
+        for neighbor, bit in neighbors:
+            if not visited & bit:
+                self.lookups += 1
+                if tiles[neighbor][0] not in children:
+                    self.prunes += 1
+
+    def add_step(self, found: bool, depth: int) -> None:
+        """
+        Function counts a lookup of the simple solvers.
+        :param found: True if a word continues with the tile
+        :param depth: The length of the path with the tile
+        """
+        self.lookups += 1
+        if not found:
+            self.prunes += 1
+            return
+        self.nodes_visited += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def add_cell_time(self, coordinate: Coordinate, seconds: float) -> None:
+        """
+        Function adds the time of the search from a start cell.
+        :param coordinate: The coordinate of the start cell
+        :param seconds: The seconds the search took
+        """
+        self.cell_times[coordinate] = \
+            self.cell_times.get(coordinate, 0) + seconds
+        if self.on_cell is not None:
+            self.on_cell(coordinate, seconds, self)
+
+    def get_total_time(self) -> float:
+        """Returns the seconds the searches from all the cells took"""
+        return sum(self.cell_times.values())
+
+    def get_slowest_cell(self) -> Optional[Tuple[Coordinate, float]]:
+        """Returns the start cell that took the longest and its seconds, None
+        if no cell was searched"""
+        if not self.cell_times:
+            return None
+        return max(self.cell_times.items(), key=lambda item: item[1])
+
+    def to_dict(self) -> Dict:
+        """Returns the stats as a dict that can be written as JSON"""
+        slowest = self.get_slowest_cell()
+        return {"nodes_visited": self.nodes_visited,
+                "prunes": self.prunes,
+                "lookups": self.lookups,
+                "max_depth": self.max_depth,
+                "seconds": round(self.get_total_time(), 6),
+                "slowest_cell": None if slowest is None else
+                {"cell": list(slowest[0]), "seconds": round(slowest[1], 6)}}
+
+    def __str__(self) -> str:
+        """Returns a one line summary of the stats"""
+        slowest = self.get_slowest_cell()
+        text = (f"{self.nodes_visited} nodes visited, {self.lookups} "
+                f"lookups, {self.prunes} prunes, max depth {self.max_depth}, "
+                f"{1000 * self.get_total_time():.2f} ms")
+        if slowest is not None:
+            text += (f", slowest cell {slowest[0]} "
+                     f"{1000 * slowest[1]:.2f} ms")
+        return text
@@ -0,0 +1,223 @@
+from typing import Dict, Iterable, Iterator, Optional, List, Set
+
+
+class TrieNode:
+    """A single node of the words trie"""
+    __slots__ = ("children", "is_word")
+
+    def __init__(self):
+        """
+        Initialize an empty trie node
+        """
+        self.children: Dict[str, TrieNode] = dict()
+        self.is_word = False
+
+
+class PathNode:
+    """A single node of a path prefix index"""
+    __slots__ = ("children", "words")
+
+    def __init__(self):
+        """
+        Initialize an empty path node
+        """
+        self.children: Dict[int, PathNode] = dict()
+        # The words that have a path starting with the path of the node
+        self.words: Set[str] = set()
+
+
+class PathIndex:
+    """A prefix trie of the paths of the words on a board, by the index of
+    every cell in the flattened board. Filled by the solver, so the words a
+    partial path can still become are known without searching again."""
+    def __init__(self):
+        """
+        Initialize an empty index
+        """
+        self.__root = PathNode()
+
+    def add_path(self, cells: Iterable[int], word: str) -> None:
+        """
+        Function adds a path of a word to the index.
+        :param cells: The path as cell indexes
+        :param word: The word of the path
+        """
+        node = self.__root
+        node.words.add(word)
+        for cell in cells:
+            child = node.children.get(cell)
+            if child is None:
+                child = PathNode()
+                node.children[cell] = child
+            node = child
+            node.words.add(word)
+
+    def get_root(self) -> PathNode:
+        """Returns the node of the empty path"""
+        return self.__root
+
+    def find_node(self, cells: Iterable[int]) -> Optional[PathNode]:
+        """
+        Function returns the node of a path.
+        :param cells: The path as cell indexes
+        :return: The node of the path, None if no word starts with the path.
+        """
+        node = self.__root
+        for cell in cells:
+            node = node.children.get(cell)
+            if node is None:
+                return None
+        return node
+
+
+class WordTrie:
+    """A prefix trie of words, used by the solver to walk the dictionary in
+    lockstep with the board and stop as soon as no word can be built."""
+    def __init__(self, words: Iterable[str] = ()):
+        """
+        Initialize the trie with the given words
+        :param words: An iterable of words
+        """
+        self.__root = TrieNode()
+        self.__size = 0
+        self.__max_length = 0
+        self.__is_minimized = False
+        for word in words:
+            self.add_word(word)
+
+    @classmethod
+    def from_root(cls, root: TrieNode, size: int, max_length: int,
+                  is_minimized: bool = True) -> "WordTrie":
+        """
+        Function creates a trie around nodes that were already built, for
+        example when loading a compiled dictionary.
+        :param root: The root node of the trie
+        :param size: The number of words in the trie
+        :param max_length: The length of the longest word in the trie
+        :param is_minimized: True if nodes may be shared between prefixes
+        :return: A new WordTrie
+        """
+        trie = cls()
+        trie.__root = root
+        trie.__size = size
+        trie.__max_length = max_length
+        trie.__is_minimized = is_minimized
+        return trie
+
+    def add_word(self, word: str) -> None:
+        """
+        Function adds a word to the trie. Words can't be added after the
+        trie is minimized, since its nodes are shared between prefixes.
+        :param word: The word to add
+        """
+        if self.__is_minimized:
+            raise ValueError("Can't add words to a minimized trie")
+        node = self.__root
+        for letter in word:
+            child = node.children.get(letter)
+            if child is None:
+                child = TrieNode()
+                node.children[letter] = child
+            node = child
+        if not node.is_word:
+            node.is_word = True
+            self.__size += 1
+            self.__max_length = max(self.__max_length, len(word))
+
+    def get_root(self) -> TrieNode:
+        """Returns the root node of the trie"""
+        return self.__root
+
+    def minimize(self) -> None:
+        """
+        Function merges all the identical sub-tries, so the trie becomes a
+        DAWG (directed acyclic word graph) that holds each distinct word
+        ending once. This shrinks the full dictionary about 8 times.
+        """
+        self.__root = merge_equal_nodes(self.__root, dict())
+        self.__is_minimized = True
+
+    def is_minimized(self) -> bool:
+        """Returns True if the trie was minimized, False otherwise"""
+        return self.__is_minimized
+
+    def get_max_length(self) -> int:
+        """Returns the length of the longest word in the trie"""
+        return self.__max_length
+
+    def find_node(self, prefix: str) -> Optional[TrieNode]:
+        """
+        Function returns the node the given prefix leads to.
+        :param prefix: The start of a word
+        :return: The node of the prefix, None if no word starts with it.
+        """
+        return step_node(self.__root, prefix)
+
+    def has_prefix(self, prefix: str) -> bool:
+        """
+        Function checks if any word in the trie starts with the prefix.
+        :param prefix: The start of a word
+        :return: True if a word starts with the prefix, False otherwise.
+        """
+        return self.find_node(prefix) is not None
+
+    def __contains__(self, word: object) -> bool:
+        """Returns True if the word is in the trie, False otherwise"""
+        if not isinstance(word, str):
+            return False
+        node = self.find_node(word)
+        return node is not None and node.is_word
+
+    def __len__(self) -> int:
+        """Returns the number of words in the trie"""
+        return self.__size
+
+    def __iter__(self) -> Iterator[str]:
+        """Yields all the words in the trie in sorted order"""
+        letters: List[str] = []
+        stack = [(self.__root, iter(sorted(self.__root.children.items())))]
+        if self.__root.is_word:
+            yield ""
+        while stack:
+            node, children = stack[-1]
+            for letter, child in children:
+                letters.append(letter)
+                if child.is_word:
+                    yield "".join(letters)
+                stack.append((child, iter(sorted(child.children.items()))))
+                break
+            else:
+                stack.pop()
+                if letters:
+                    letters.pop()
+
+
+def step_node(node: TrieNode, tile: str) -> Optional[TrieNode]:
+    """
+    Function follows the letters of a tile (which may have more than one
+    letter, like 'QU') from the given node.
+    :param node: A trie node
+    :param tile: The letters to follow
+    :return: The node reached, None if there is no such prefix.
+    """
+    for letter in tile:
+        node = node.children.get(letter)
+        if node is None:
+            return None
+    return node
+
+
+def merge_equal_nodes(node: TrieNode, registry: Dict[tuple, TrieNode]) \
+        -> TrieNode:
+    """
+    Function merges the identical sub-tries under the given node, bottom up.
+    :param node: A trie node
+    :param registry: A dict of the nodes kept so far by their structure
+    :return: The node to use instead of the given node
+    """
+    key = [node.is_word]
+    for letter in sorted(node.children):
+        child = merge_equal_nodes(node.children[letter], registry)
+        node.children[letter] = child
+        key.append((letter, id(child)))
+    return registry.setdefault(tuple(key), node)
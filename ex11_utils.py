@@ -1,13 +1,28 @@
-from typing import List, Tuple, Iterable, Optional, Set
+from typing import List, Tuple, Iterable, Optional, Set, Dict, Iterator
 from copy import deepcopy
+from itertools import count
+import time
+from boggle_trie import WordTrie, TrieNode, PathIndex, step_node
+from boggle_dictionary import LetterIndex, LetterCountIndex, \
+    get_letters_signature, get_tiles_signature
+import boggle_compact
+from boggle_compact import CompactBoard, CellsPath, DIRECTIONS
+from boggle_stats import SolverStats
 
 Board = List[List[str]]
 Path = List[Tuple[int, int]]
 Coordinate = Tuple[int, int]
 VisitedBoard = List[List[bool]]
 
-DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1),
-              (1, 1)]
+# Solver modes: the simple mode copies the path and visited board on every
+# step, the fast mode keeps a visited bitmask and one shared path stack.
+SIMPLE_MODE = "simple"
+FAST_MODE = "fast"
+# solve_board_batch builds one trie of all the words of a words list when
+# the boards have this many cells together. Building it takes about as
+# long as filtering the words for this many cells of boards one at a
+# time, the most for small boards, whose filtering is the cheapest per cell
+BATCH_TRIE_CELLS = 600
 
 
 def is_valid_path(board: Board, path: Path, words: Iterable[str]) \
@@ -70,40 +85,50 @@ def is_valid_distance(curr_coordinate: Coordinate, next_coordinate:
 
 def backtrack_path_finder(row: int, col: int, path: List[Coordinate],
                           visited: VisitedBoard, board: Board,
-                          valid_words: Iterable[str], result: List[Path],
-                          n: int, curr_word: str, length_type) -> None:
+                          node: TrieNode, n: int, curr_word: str,
+                          length_type,
+                          stats: Optional[SolverStats] = None) \
+        -> Iterator[Path]:
     """
-    Function helps find all the appropriate paths using backtracking.
+    Function helps find all the appropriate paths using backtracking, and
+    yields every path as soon as it is found. The words trie is walked
+    together with the board, so a path is dropped as soon as no word starts
+    with its letters.
     :param row: The index of the row
     :param col: The index of the column
     :param path: The current path to explore
     :param visited: A board of all the visited places, so they aren't explored
     :param board: A game board
-    :param valid_words: An iterable of all the words that are possible
-    :param result: A list of coordinates of the possible paths
+    :param node: The trie node of the word built so far
     :param n: The variable n that controls the length of the path or word
     :param curr_word: The current word being built
     :param length_type: If n represents the length of path or length of word
-    :return: Function does not return, updates results argument in place.
+    :param stats: Stats to count the work of the search in, if given
+    :return: An iterator of the found paths
     """
+    # Follow the current letter in the trie, stop if no word starts this way
+    node = step_node(node, board[row][col])
+    if stats is not None:
+        stats.add_step(node is not None, len(path) + 1)
+    if node is None:
+        return
+
     # Append the current letter to the current word and coordinate to path list
     curr_word += board[row][col]
     curr_path = path + [(row, col)]
 
     visited[row][col] = True    # Mark the current position as visited
-    valid_words = get_relevant_words(valid_words, curr_word, n)
-    if len(valid_words) == 0:
-        return
 
-    # Check if length of path or word is valid and the word is in valid_words
-    if length_type == "path":
-        if len(curr_path) == n and curr_word in valid_words:
-            result.append(deepcopy(curr_path))
-            return
-    if length_type == "word":
-        if len(curr_word) == n and curr_word in valid_words:
-            result.append(deepcopy(curr_path))
-            return
+    # Check if length of path or word is valid and the word is in the trie.
+    # Longer paths can't be of length n, so there is no need to go on.
+    if length_type == "path" and len(curr_path) >= n:
+        if len(curr_path) == n and node.is_word:
+            yield deepcopy(curr_path)
+        return
+    if length_type == "word" and len(curr_word) >= n:
+        if len(curr_word) == n and node.is_word:
+            yield deepcopy(curr_path)
+        return
 
     # Move through all directions
     for dy, dx in DIRECTIONS:
@@ -112,63 +137,304 @@ def backtrack_path_finder(row: int, col: int, path: List[Coordinate],
         # Check if the new coord is within the board boundaries and not visited
         if is_in_board(board, (new_row, new_col)) \
                 and not visited[new_row][new_col]:
-            backtrack_path_finder(new_row, new_col, curr_path[:],
-                                  deepcopy(visited), board, valid_words,
-                                  result, n, curr_word, length_type)
+            yield from backtrack_path_finder(new_row, new_col, curr_path[:],
+                                             deepcopy(visited), board, node,
+                                             n, curr_word, length_type,
+                                             stats)
 
 
-def find_length_n_paths(n: int, board: Board, words: Iterable[str]) \
-        -> List[Path]:
+def get_words_trie(board: Board, words: Iterable[str],
+                   word_length: Optional[int] = None) -> WordTrie:
     """
-    Function receives a board, a length n and an iterable of words and
-    returns a list of paths that build words in the words iterable of path
-    length n.
+    Function receives a board and an iterable of words and returns a trie
+    of the words. If words is already a trie it is used as is, and a
+    LetterCountIndex gives the shared trie of its words. Otherwise only the
+    words that their letters are on the board are added to it.
+    :param board: A game board
+    :param words: An iterable of words, a WordTrie or a LetterCountIndex
+    :param word_length: The length of the words that are looked for, all
+    the lengths if None
+    :return: A trie of the relevant words
+    """
+    if isinstance(words, WordTrie):
+        return words
+    if isinstance(words, LetterCountIndex):
+        # The search never uses more tiles than the board has, so the
+        # shared trie of the index is searched as is
+        return words.get_trie()
+    if word_length is not None:
+        words = [word for word in words if len(word) == word_length]
+    # Remove words that their letters are not on the board
+    return WordTrie(get_word_letters_in_board(board, words))
+
+
+def get_neighbors_table(board: Board) -> List[List[Tuple[int, int]]]:
+    """
+    Function receives a board and returns for every cell (by its index in
+    the flattened board) the cells next to it, in the order of DIRECTIONS.
+    The table is shared by all the boards of the same size and must not be
+    changed.
+    :param board: A game board
+    :return: A list of (cell index, cell bit) pairs for every cell
+    """
+    return boggle_compact.get_neighbors_table(len(board), len(board[0]))
+
+
+def get_neighbor_masks(board: Board) -> List[int]:
+    """
+    Function receives a board and returns for every cell (by its index in
+    the flattened board) a bitmask of the cells next to it, where the bit of
+    cell i is 1 << i. The list is shared by all the boards of the same size
+    and must not be changed.
+    :param board: A game board
+    :return: A list of the neighbors bitmask of every cell
+    """
+    return boggle_compact.get_neighbor_masks(len(board), len(board[0]))
+
+
+def cells_to_path(cells: Iterable[int], cols: int) -> Path:
+    """
+    Function converts a sequence of flattened cell indexes into a path.
+    :param cells: Indexes of cells in the flattened board
+    :param cols: The number of columns in the board
+    :return: A path of coordinates
+    """
+    return [(cell // cols, cell % cols) for cell in cells]
+
+
+def fast_path_finder(cell: int, root: TrieNode, board: CompactBoard, n: int,
+                     length_type: str, stats: Optional[SolverStats] = None) \
+        -> Iterator[CellsPath]:
+    """
+    Function finds the paths that start at the given cell like
+    backtrack_path_finder, but without copying anything on the way: the
+    visited cells are bits of an int, and the path is one list that cells
+    are pushed to and popped from. The search keeps its own stack instead
+    of recursing, so every path is yielded straight to the caller.
+    :param cell: The index of the start cell in the flattened board
+    :param root: The root node of the words trie
+    :param board: The compact game board
+    :param n: The variable n that controls the length of the path or word
+    :param length_type: If n represents the length of path or length of word
+    :param stats: Stats to count the work of the search in, if given
+    :return: An iterator of the found paths as encoded cell indexes
+    """
+    tiles = board.tiles
+    neighbors = board.neighbors
+    encode_path = board.encode_path
+    by_path = length_type == "path"
+    node = step_node(root, tiles[cell])
+    length = 1 if by_path else len(tiles[cell])
+    if stats is not None:
+        stats.lookups += 1
+        if node is None:
+            stats.prunes += 1
+        else:
+            stats.add_node(1, 1 << cell,
+                           node.children if length < n else None, tiles,
+                           neighbors[cell])
+    if node is None:
+        return
+    if length >= n:
+        if length == n and node.is_word:
+            yield encode_path((cell,))
+        return
+
+    path = [cell]
+    visited = 1 << cell
+    # The trie children, the path or word length and the neighbors left to
+    # try of the last cell of the path, and those of the cells before it
+    children = node.children
+    moves = iter(neighbors[cell])
+    stack = []
+    while True:
+        for neighbor, bit in moves:
+            if visited & bit:
+                continue
+            tile = tiles[neighbor]
+            child = children.get(tile[0])
+            if child is None:
+                continue
+            if len(tile) > 1:
+                child = step_node(child, tile[1:])
+                if child is None:
+                    if stats is not None:
+                        stats.prunes += 1
+                    continue
+            next_length = length + (1 if by_path else len(tile))
+            if stats is not None:
+                stats.add_node(len(path) + 1, visited | bit,
+                               child.children if next_length < n else None,
+                               tiles, neighbors[neighbor])
+            if next_length >= n:
+                if next_length == n and child.is_word:
+                    yield encode_path((*path, neighbor))
+                continue
+            if not child.children:
+                continue
+            # Go on from the neighbor
+            stack.append((children, length, moves))
+            path.append(neighbor)
+            visited |= bit
+            children = child.children
+            length = next_length
+            moves = iter(neighbors[neighbor])
+            break
+        else:
+            # Every neighbor was tried, step back
+            if not stack:
+                return
+            visited &= ~(1 << path.pop())
+            children, length, moves = stack.pop()
+
+
+def iter_length_n(n: int, board: Board, words: Iterable[str],
+                  length_type: str, mode: str,
+                  stats: Optional[SolverStats] = None) -> Iterator[Path]:
+    """
+    Function yields the paths that build words in the words iterable, of
+    path length n or of word length n according to length_type, as soon as
+    they are found. Only the search stack is kept, so stopping early saves
+    the rest of the search and the paths are never gathered in memory.
     :param n: A length int
     :param board: A game board
-    :param words: An iterable of words
-    :return: A list of paths of all the valid words of path length n
+    :param words: An iterable of words, a WordTrie or a LetterCountIndex
+    :param length_type: If n represents the length of path or length of word
+    :param mode: SIMPLE_MODE or FAST_MODE
+    :param stats: Stats to count the work of the search in, if given. The
+    time of every start cell includes the time the caller took for its
+    paths.
+    :return: An iterator of the paths of all the valid words of length n
     """
     rows = len(board)
     cols = len(board[0])
     if rows == 0 or cols == 0:
-        return []
+        return
 
-    # Remove words that their letters are not on the board
-    valid_words = get_word_letters_in_board(board, words)
-    result = []
+    trie = get_words_trie(board, words,
+                          n if length_type == "word" else None)
+
+    if mode == SIMPLE_MODE:
+        # Iterate through each cell of the board and perform backtracking
+        for i in range(rows):
+            for j in range(cols):
+                # Initialize a visited matrix for each starting cell
+                visited = [[False] * cols for _ in range(rows)]
+                start = time.perf_counter()
+                yield from backtrack_path_finder(i, j, [], visited, board,
+                                                 trie.get_root(), n, "",
+                                                 length_type, stats)
+                if stats is not None:
+                    stats.add_cell_time((i, j), time.perf_counter() - start)
+        return
 
-    # Iterate through each cell of the board and perform backtracking
-    for i in range(rows):
-        for j in range(cols):
-            visited = [[False] * cols for _ in range(rows)]
-            backtrack_path_finder(i, j, [], visited, board, valid_words,
-                                  result, n, "", "path")
+    compact_board = CompactBoard(board)
+    for cell in range(rows * cols):
+        start = time.perf_counter()
+        for cells in fast_path_finder(cell, trie.get_root(), compact_board, n,
+                                      length_type, stats):
+            yield compact_board.decode_path(cells)
+        if stats is not None:
+            stats.add_cell_time(divmod(cell, cols),
+                                time.perf_counter() - start)
 
-    return result
+
+def find_length_n(n: int, board: Board, words: Iterable[str],
+                  length_type: str, mode: str,
+                  stats: Optional[SolverStats] = None) -> List[Path]:
+    """
+    Function finds the paths that build words in the words iterable, of
+    path length n or of word length n according to length_type.
+    :param n: A length int
+    :param board: A game board
+    :param words: An iterable of words, a WordTrie or a LetterCountIndex
+    :param length_type: If n represents the length of path or length of word
+    :param mode: SIMPLE_MODE or FAST_MODE
+    :param stats: Stats to count the work of the search in, if given
+    :return: A list of paths of all the valid words of length n
+    """
+    return list(iter_length_n(n, board, words, length_type, mode, stats))
+
+
+def find_cell_length_n(cell: int, root: TrieNode, board: CompactBoard, n: int,
+                       length_type: str,
+                       stats: Optional[SolverStats] = None) \
+        -> List[CellsPath]:
+    """
+    Function finds the paths that start at the given cell and build words
+    of path length n or of word length n according to length_type.
+    :param cell: The index of the start cell in the flattened board
+    :param root: The root node of the words trie
+    :param board: The compact game board
+    :param n: A length int
+    :param length_type: If n represents the length of path or length of word
+    :param stats: Stats to count the work of the search in, if given
+    :return: A list of the found paths as encoded cell indexes
+    """
+    return list(fast_path_finder(cell, root, board, n, length_type, stats))
+
+
+def iter_length_n_paths(n: int, board: Board, words: Iterable[str],
+                        mode: str = FAST_MODE,
+                        stats: Optional[SolverStats] = None) -> Iterator[Path]:
+    """
+    Function receives a board, a length n and an iterable of words and
+    yields the paths that build words in the words iterable of path length
+    n, in the order of find_length_n_paths.
+    :param n: A length int
+    :param board: A game board
+    :param words: An iterable of words
+    :param mode: SIMPLE_MODE or FAST_MODE
+    :param stats: Stats to count the work of the search in, if given
+    :return: An iterator of the paths of all the valid words of path
+    length n
+    """
+    return iter_length_n(n, board, words, "path", mode, stats)
+
+
+def find_length_n_paths(n: int, board: Board, words: Iterable[str],
+                        mode: str = FAST_MODE,
+                        stats: Optional[SolverStats] = None) -> List[Path]:
+    """
+    Function receives a board, a length n and an iterable of words and
+    returns a list of paths that build words in the words iterable of path
+    length n.
+    :param n: A length int
+    :param board: A game board
+    :param words: An iterable of words
+    :param mode: SIMPLE_MODE or FAST_MODE
+    :param stats: Stats to count the work of the search in, if given
+    :return: A list of paths of all the valid words of path length n
+    """
+    return list(iter_length_n_paths(n, board, words, mode, stats))
 
 
 def get_word_letters_in_board(board: Board, words: Iterable[str]) -> \
         Set[str]:
     """
     Function receives an iterable of words and returns a set of all the
-    words that their letters appear on the board.
+    words that their letters appear on the board. A 'QU' tile only counts
+    for a 'QU' in the word. If words is a LetterIndex, only the words with
+    matching letter signatures are looked at, and if it is a
+    LetterCountIndex, only the words the board has enough of every letter
+    for.
     :param board: A game board
-    :param words: An iterable of words
+    :param words: An iterable of words, a LetterIndex or a LetterCountIndex
     :return: A new set of words that all their letters appear on the board
     """
-    valid_words = set()
+    if isinstance(words, LetterCountIndex):
+        return words.get_words_for_tiles(tile for row in board
+                                         for tile in row)
+    board_signature = get_tiles_signature(tile for row in board
+                                          for tile in row)
+    if isinstance(words, LetterIndex):
+        return words.get_words_with_letters(board_signature)
+
+    # Checking the letters set first is much faster than the signature
     board_letters = get_letters_in_board(board)
-
-    for word in words:
-        is_valid_word = True
-        word_letters = set(word)
-        for letter in word_letters:
-            if letter not in board_letters:
-                is_valid_word = False
-                break
-        if is_valid_word:
-            valid_words.add(word)
-    return valid_words
+    missing = ~board_signature
+    return {word for word in words if board_letters.issuperset(word)
+            and not get_letters_signature(word) & missing}
 
 
 def get_letters_in_board(board: Board) -> Set[str]:
@@ -185,8 +451,26 @@ def get_letters_in_board(board: Board) -> Set[str]:
     return board_letters
 
 
-def find_length_n_words(n: int, board: Board, words: Iterable[str])\
-        -> List[Path]:
+def iter_words(n: int, board: Board, words: Iterable[str],
+               mode: str = FAST_MODE,
+               stats: Optional[SolverStats] = None) -> Iterator[Path]:
+    """
+    Function receives a board, a length n and an iterable of words and
+    yields the paths that build words in the words iterable of length n, in
+    the order of find_length_n_words.
+    :param n: A length int
+    :param board: A game board
+    :param words: An iterable of words
+    :param mode: SIMPLE_MODE or FAST_MODE
+    :param stats: Stats to count the work of the search in, if given
+    :return: An iterator of the paths of all the valid words of length n
+    """
+    return iter_length_n(n, board, words, "word", mode, stats)
+
+
+def find_length_n_words(n: int, board: Board, words: Iterable[str],
+                        mode: str = FAST_MODE,
+                        stats: Optional[SolverStats] = None) -> List[Path]:
     """
         Function receives a board, a length n and an iterable of words and
         returns a list of paths that build words in the words iterable of
@@ -194,81 +478,438 @@ def find_length_n_words(n: int, board: Board, words: Iterable[str])\
         :param n: A length int
         :param board: A game board
         :param words: An iterable of words
+        :param mode: SIMPLE_MODE or FAST_MODE
+        :param stats: Stats to count the work of the search in, if given
         :return: A list of paths of all the valid words of length n
         """
-    rows = len(board)
-    cols = len(board[0])
+    return list(iter_words(n, board, words, mode, stats))
 
+
+def path_count_finder(cell: int, visited: int, node: TrieNode, length: int,
+                      max_length: Optional[int], board: CompactBoard,
+                      memo: Dict[Tuple[int, int, TrieNode], Dict[str, int]],
+                      stats: Optional[SolverStats] = None) -> Dict[str, int]:
+    """
+    Function counts the paths of the words that go on from a path, without
+    building the paths. The paths that go on only depend on the last cell,
+    the visited cells and the trie node of the path, so the counts of every
+    such state are kept in memo and paths that reach a state again, like
+    ones that pass equal letters in another order, reuse them.
+    :param cell: The index of the last cell of the path
+    :param visited: A bitmask of the cells of the path, with the last cell
+    :param node: The trie node of the word of the path
+    :param length: The length of the word of the path, which the visited
+    cells decide, so it doesn't change the state
+    :param max_length: The length of the longest words to count, all the
+    lengths if None
+    :param board: The compact game board
+    :param memo: The counts of the states counted so far, shared by all the
+    calls on the board
+    :param stats: Stats to count the work of the search in, if given
+    :return: A dict of the rest of every word the path goes on to (an empty
+    string if the path is a word) and the number of paths it has. The dict
+    is kept in memo and must not be changed.
+    """
+    key = (cell, visited, node)
+    counts = memo.get(key)
+    if counts is not None:
+        return counts
+    counts = {"": 1} if node.is_word else dict()
+    children = node.children
+    if stats is not None:
+        stats.add_node(bin(visited).count("1"), visited, children,
+                       board.tiles, board.neighbors[cell])
+    if not children:
+        # Nothing goes on from a leaf, so it isn't worth keeping
+        return counts
+    tiles = board.tiles
+    for neighbor, bit in board.neighbors[cell]:
+        if visited & bit:
+            continue
+        tile = tiles[neighbor]
+        child = children.get(tile[0])
+        if child is None:
+            continue
+        if max_length is not None and length + len(tile) > max_length:
+            continue
+        if len(tile) > 1:
+            child = step_node(child, tile[1:])
+            if child is None:
+                if stats is not None:
+                    stats.prunes += 1
+                continue
+        neighbor_counts = path_count_finder(neighbor, visited | bit, child,
+                                            length + len(tile), max_length,
+                                            board, memo, stats)
+        for rest, paths in neighbor_counts.items():
+            rest = tile + rest
+            counts[rest] = counts.get(rest, 0) + paths
+    memo[key] = counts
+    return counts
+
+
+def count_word_paths(board: Board, words: Iterable[str],
+                     word_length: Optional[int] = None,
+                     stats: Optional[SolverStats] = None) -> Dict[str, int]:
+    """
+    Function receives a board and an iterable of words and counts the paths
+    of every word on the board, the number of paths find_length_n_words
+    would return for it, without building any of them.
+    :param board: A game board
+    :param words: An iterable of words, a WordTrie or a LetterCountIndex
+    :param word_length: The length of the words to count, all the lengths
+    if None
+    :param stats: Stats to count the work of the search in, if given
+    :return: A dict of every word on the board and the number of its paths
+    """
+    rows = len(board)
+    cols = len(board[0]) if rows else 0
     if rows == 0 or cols == 0:
-        return []
+        return dict()
+
+    root = get_words_trie(board, words, word_length).get_root()
+    compact_board = CompactBoard(board)
+    tiles = compact_board.tiles
+    memo = dict()
+    word_counts = dict()
+    for cell in range(rows * cols):
+        start = time.perf_counter()
+        node = step_node(root, tiles[cell])
+        if stats is not None:
+            stats.lookups += 1
+            if node is None:
+                stats.prunes += 1
+        if node is not None:
+            cell_counts = path_count_finder(cell, 1 << cell, node,
+                                            len(tiles[cell]), word_length,
+                                            compact_board, memo, stats)
+            for rest, paths in cell_counts.items():
+                word = tiles[cell] + rest
+                if word_length is None or len(word) == word_length:
+                    word_counts[word] = word_counts.get(word, 0) + paths
+        if stats is not None:
+            stats.add_cell_time(divmod(cell, cols),
+                                time.perf_counter() - start)
+    return word_counts
+
+
+def count_length_n_words(n: int, board: Board, words: Iterable[str],
+                         stats: Optional[SolverStats] = None) \
+        -> Dict[str, int]:
+    """
+    Function receives a board, a length n and an iterable of words and
+    counts the paths of every word of length n on the board, so the counts
+    add up to the length of find_length_n_words.
+    :param n: A length int
+    :param board: A game board
+    :param words: An iterable of words, a WordTrie or a LetterCountIndex
+    :param stats: Stats to count the work of the search in, if given
+    :return: A dict of every word of length n on the board and the number
+    of its paths
+    """
+    return count_word_paths(board, words, n, stats)
 
-    # Remove words that their letters are not on the board
-    valid_words = get_word_letters_in_board(board, words)
-    result = []
 
-    # Iterate through each cell of the board and perform backtracking
-    for i in range(rows):
-        for j in range(cols):
-            # Initialize a visited matrix for each starting cell
-            visited = [[False] * cols for _ in range(rows)]
-            backtrack_path_finder(i, j, [], visited, board, valid_words,
-                                  result, n, "", "word")
+def get_length_totals(word_counts: Dict[str, int]) -> Dict[int, int]:
+    """
+    Function adds up the path counts of the words of every length.
+    :param word_counts: A dict of words and the number of their paths
+    :return: A dict of every word length and the number of paths of the
+    words of that length
+    """
+    totals = dict()
+    for word, paths in word_counts.items():
+        totals[len(word)] = totals.get(len(word), 0) + paths
+    return totals
 
-    return result
 
+def backtrack_word_finder(row: int, col: int, path: List[Coordinate],
+                          visited: VisitedBoard, board: Board,
+                          node: TrieNode, curr_word: str,
+                          best_paths: Dict[str, Path],
+                          first_found: Dict[str, Tuple[int, int]],
+                          found_order: Iterator[int],
+                          path_index: Optional[PathIndex] = None,
+                          stats: Optional[SolverStats] = None) -> None:
+    """
+    Function helps find every word on the board in a single backtracking
+    run, keeping the longest path found for each word.
+    :param row: The index of the row
+    :param col: The index of the column
+    :param path: The current path to explore
+    :param visited: A board of all the visited places, so they aren't explored
+    :param board: A game board
+    :param node: The trie node of the word built so far
+    :param curr_word: The current word being built
+    :param best_paths: A dict of each word found and its longest path
+    :param first_found: A dict of each word found and the (path length,
+    finding order) it was first found with, used to order the results
+    :param found_order: A counter of the words found, for the finding order
+    :param path_index: An index to add every path of every word to, if given
+    :param stats: Stats to count the work of the search in, if given
+    :return: Function does not return, updates best_paths and first_found in
+    place.
+    """
+    node = step_node(node, board[row][col])
+    if stats is not None:
+        stats.add_step(node is not None, len(path) + 1)
+    if node is None:
+        return
+
+    curr_word += board[row][col]
+    curr_path = path + [(row, col)]
+    visited[row][col] = True
+
+    if node.is_word:
+        # Keep the first path found for each word out of its longest paths
+        if curr_word not in best_paths or \
+                len(curr_path) > len(best_paths[curr_word]):
+            best_paths[curr_word] = deepcopy(curr_path)
+        if curr_word not in first_found or \
+                len(curr_path) < first_found[curr_word][0]:
+            first_found[curr_word] = (len(curr_path), next(found_order))
+        if path_index is not None:
+            cols = len(board[0])
+            path_index.add_path((r * cols + c for r, c in curr_path),
+                                curr_word)
 
-def max_score_paths(board: Board, words: Iterable[str]) -> List[Path]:
+    for dy, dx in DIRECTIONS:
+        new_row, new_col = row + dy, col + dx
+        if is_in_board(board, (new_row, new_col)) \
+                and not visited[new_row][new_col]:
+            backtrack_word_finder(new_row, new_col, curr_path,
+                                  deepcopy(visited), board, node, curr_word,
+                                  best_paths, first_found, found_order,
+                                  path_index, stats)
+
+
+def fast_word_finder(cell: int, visited: int, node: TrieNode,
+                     board: CompactBoard, path: List[int], letters: List[str],
+                     best_paths: Dict[str, CellsPath],
+                     first_found: Dict[str, Tuple[int, int]],
+                     found_order: Iterator[int],
+                     path_index: Optional[PathIndex] = None,
+                     stats: Optional[SolverStats] = None) -> None:
+    """
+    Function finds every word on the board like backtrack_word_finder, but
+    keeps the visited cells as bits of an int and pushes and pops the cells
+    and letters of one shared path, so nothing is copied on the way.
+    :param cell: The index of the cell in the flattened board
+    :param visited: A bitmask of the visited cells
+    :param node: The trie node of the word built so far
+    :param board: The compact game board
+    :param path: The current path as cell indexes, shared by all the calls
+    :param letters: The letters of the current path, shared by all the calls
+    :param best_paths: A dict of each word found and its longest path as
+    encoded cell indexes
+    :param first_found: A dict of each word found and the (path length,
+    finding order) it was first found with, used to order the results
+    :param found_order: A counter of the words found, for the finding order
+    :param path_index: An index to add every path of every word to, if given
+    :param stats: Stats to count the work of the search in, if given
+    :return: Function does not return, updates best_paths and first_found in
+    place.
+    """
+    tiles = board.tiles
+    tile = tiles[cell]
+    for letter in tile:
+        node = node.children.get(letter)
+        if node is None:
+            if stats is not None:
+                stats.prunes += 1
+            return
+    path.append(cell)
+    letters.append(tile)
+    if stats is not None:
+        stats.add_node(len(path), visited | 1 << cell, node.children, tiles,
+                       board.neighbors[cell])
+
+    if node.is_word:
+        word = "".join(letters)
+        # Keep the first path found for each word out of its longest paths
+        if word not in best_paths or len(path) > len(best_paths[word]):
+            best_paths[word] = board.encode_path(path)
+        if word not in first_found or len(path) < first_found[word][0]:
+            first_found[word] = (len(path), next(found_order))
+        if path_index is not None:
+            path_index.add_path(path, word)
+
+    children = node.children
+    if children:
+        visited |= 1 << cell
+        for neighbor, bit in board.neighbors[cell]:
+            if not visited & bit and tiles[neighbor][0] in children:
+                fast_word_finder(neighbor, visited, node, board, path,
+                                 letters, best_paths, first_found,
+                                 found_order, path_index, stats)
+    path.pop()
+    letters.pop()
+
+
+def find_cell_words(cell: int, root: TrieNode, board: CompactBoard,
+                    path_index: Optional[PathIndex] = None,
+                    stats: Optional[SolverStats] = None) \
+        -> Tuple[Dict[str, CellsPath], Dict[str, Tuple[int, int]]]:
+    """
+    Function finds all the words on the board that their path starts at the
+    given cell.
+    :param cell: The index of the start cell in the flattened board
+    :param root: The root node of the words trie
+    :param board: The compact game board
+    :param path_index: An index to add every path of every word to, if given
+    :param stats: Stats to count the work of the search in, if given
+    :return: A tuple of a dict of each word found and its longest path as
+    encoded cell indexes, and a dict of each word found and the (path length,
+    finding order) it was first found with.
+    """
+    best_paths = dict()
+    first_found = dict()
+    start = time.perf_counter()
+    if stats is not None:
+        # The start cell is looked up from the root, the other cells are
+        # counted by the cell before them
+        stats.lookups += 1
+    fast_word_finder(cell, 0, root, board, [], [], best_paths, first_found,
+                     count(), path_index, stats)
+    if stats is not None:
+        stats.add_cell_time(divmod(cell, board.cols),
+                            time.perf_counter() - start)
+    return best_paths, first_found
+
+
+def merge_cells_words(cells_words: Iterable[Tuple[Dict[str, CellsPath],
+                                                  Dict[str, Tuple[int, int]]]],
+                      cols: int) -> Dict[str, Path]:
+    """
+    Function merges the words found from every start cell, given in the
+    order of the cells, into the result of solve_board.
+    :param cells_words: The results of find_cell_words for every cell
+    :param cols: The number of columns in the board
+    :return: A dict of every word on the board and its longest path
+    """
+    best_paths = dict()
+    first_found = dict()
+    for cell, (cell_paths, cell_found) in enumerate(cells_words):
+        for word, cells in cell_paths.items():
+            if word not in best_paths or len(cells) > len(best_paths[word]):
+                best_paths[word] = cells
+        for word, (length, order) in cell_found.items():
+            if word not in first_found or length < first_found[word][0]:
+                first_found[word] = (length, cell, order)
+
+    ordered_words = sorted(first_found, key=first_found.get)
+    return {word: cells_to_path(best_paths[word], cols)
+            for word in ordered_words}
+
+
+def solve_board(board: Board, words: Iterable[str],
+                mode: str = FAST_MODE,
+                path_index: Optional[PathIndex] = None,
+                stats: Optional[SolverStats] = None) -> Dict[str, Path]:
+    """
+    Function receives a board and an iterable of words and finds all the
+    words on the board with a single search over the board. Every word is
+    given its longest path, so together the paths yield the highest score.
+    The words are ordered by the length of their shortest path and then by
+    the order they were found in.
+    :param board: A game board
+    :param words: An iterable of words, a WordTrie or a LetterCountIndex
+    :param mode: SIMPLE_MODE or FAST_MODE
+    :param path_index: An index to add every path of every word to, if given
+    :param stats: Stats to count the work of the search in, if given
+    :return: A dict of every word on the board and its longest path
+    """
+    rows = len(board)
+    cols = len(board[0]) if rows else 0
+    if rows == 0 or cols == 0:
+        return dict()
+
+    trie = get_words_trie(board, words)
+    if mode == SIMPLE_MODE:
+        best_paths = dict()
+        first_found = dict()
+        found_order = count()
+        for i in range(rows):
+            for j in range(cols):
+                visited = [[False] * cols for _ in range(rows)]
+                start = time.perf_counter()
+                backtrack_word_finder(i, j, [], visited, board,
+                                      trie.get_root(), "", best_paths,
+                                      first_found, found_order, path_index,
+                                      stats)
+                if stats is not None:
+                    stats.add_cell_time((i, j), time.perf_counter() - start)
+        ordered_words = sorted(first_found, key=first_found.get)
+        return {word: best_paths[word] for word in ordered_words}
+
+    compact_board = CompactBoard(board)
+    return merge_cells_words((find_cell_words(cell, trie.get_root(),
+                                              compact_board, path_index,
+                                              stats)
+                              for cell in range(rows * cols)), cols)
+
+
+def solve_board_batch(boards: Iterable[Board], words: Iterable[str],
+                      mode: str = FAST_MODE) -> List[Dict[str, Path]]:
+    """
+    Function solves many boards, like calling solve_board on every board,
+    and is never slower than that. Boards that appear more than once are
+    solved once. A WordTrie or a LetterCountIndex is one shared trie that
+    every board is searched in, as solve_board would. The words of a words
+    list are filtered for every board like solve_board does, unless the
+    boards are big enough together that building one trie of all the words
+    costs less (see BATCH_TRIE_CELLS). The search of every board is its
+    own.
+    :param boards: An iterable of game boards
+    :param words: An iterable of words, a WordTrie or a LetterCountIndex
+    :param mode: SIMPLE_MODE or FAST_MODE
+    :return: The solve_board result of every board, in the order of the
+    boards
+    """
+    boards = list(boards)
+    keys = [tuple(tuple(row) for row in board) for board in boards]
+    unique_boards = {key: board for key, board in zip(keys, boards)}
+    if isinstance(words, WordTrie):
+        trie = words
+    elif isinstance(words, LetterCountIndex):
+        trie = words.get_trie()
+    else:
+        if iter(words) is words:
+            # The words are gone through again for every board
+            words = list(words)
+        cells = sum(len(board) * len(board[0])
+                    for board in unique_boards.values() if board)
+        trie = WordTrie(words) if cells >= BATCH_TRIE_CELLS else None
+
+    solved: Dict[Tuple[Tuple[str, ...], ...], Dict[str, Path]] = dict()
+    results = []
+    for key, board in zip(keys, boards):
+        board_words = solved.get(key)
+        if board_words is not None:
+            # Every result has paths of its own, like solve_board
+            results.append({word: path[:]
+                            for word, path in board_words.items()})
+            continue
+        board_words = solve_board(board, words if trie is None else trie,
+                                  mode)
+        solved[key] = board_words
+        results.append(board_words)
+    return results
+
+
+def max_score_paths(board: Board, words: Iterable[str],
+                    mode: str = FAST_MODE,
+                    stats: Optional[SolverStats] = None) -> List[Path]:
     """
     Function receives a board and an iterable of words and returns a list
     paths the yield the highest score for the board.
     :param board: A game board
     :param words: An iterable of words
+    :param mode: SIMPLE_MODE or FAST_MODE
+    :param stats: Stats to count the work of the search in, if given
     :return: A list of paths that yield the highest score
     """
-    max_path_length = len(board) * len(board[0])
-    result = dict()
-    visited_words = dict()
-    good_words = get_word_letters_in_board(board, words)
-
-    for n in range(max_path_length):
-        curr_valid_words = set([word for word in good_words if len(word) >= n])
-        if len(curr_valid_words) == 0:
-            break
-        n_paths_results = find_length_n_paths(n, board, curr_valid_words)
-        for path in n_paths_results:
-            curr_word = build_word(path, board)
-            curr_score = len(path) ** 2
-            if curr_word in visited_words.keys():
-                if curr_score > visited_words[curr_word]:
-                    visited_words[curr_word] = curr_score
-                    result[curr_word] = path
-            else:
-                visited_words[curr_word] = curr_score
-                result[curr_word] = path
-    return list(result.values())
-
-
-def get_relevant_words(words: Iterable[str], curr_word: str, n: int) \
-        -> Set[str]:
-    """
-    Function receives a words iterable, the start of a word and a length n
-    and returns all the words that are currently optional and relevant given
-    the current word.
-    :param words: An iterable of words
-    :param curr_word: the current word to see if it is the start of a word
-    in the words iterable
-    :param n: The length of the word
-    :return: A reduced set of all the words that are currently relevant.
-    """
-    relevant_words_set = set()
-    curr_length = len(curr_word)
-
-    for word in words:
-        # len(word) >= n because length of word can be longer than length of
-        # path. Deals with instance of 'QU'
-        if len(word) >= n and curr_word == word[:curr_length]:
-            relevant_words_set.add(word)
-    return relevant_words_set
+    return list(solve_board(board, words, mode, stats=stats).values())
 
 
 def build_word(path: Path, board: Board) -> str:
@@ -279,11 +920,7 @@ def build_word(path: Path, board: Board) -> str:
     :param board: A game Board
     :return: str of the built word from the path on the board
     """
-    word = ""
-    for coordinate in path:
-        row, col = coordinate
-        word += board[row][col]
-    return word
+    return "".join([board[row][col] for row, col in path])
 
 
 def get_score(paths: List[Path]) -> int: